@@ -0,0 +1,206 @@
+import os
+import struct
+from array import array
+from itertools import accumulate
+from functions import LIST_BLOCK_TYPES, PARSER_VERSION, BlockType, document_to_html_node, markdown_to_html_node, parse_document
+from manifest import hash_bytes
+from output import write_if_changed
+from textnode import TextNode, TextType
+
+# A parsed document is stored as three flat sections after a fixed header:
+#   codes    unsigned array: block count, then every block in document
+#            order: its type, then for text blocks the node count and per
+#            node its text type, for quotes the count of the blocks inside
+#            them, and for lists the item count, each item being encoded as
+#            its nodes and then the count of the lists nested in it
+#   lengths  unsigned array: length in characters of every string, in order
+#   text     every string concatenated, utf-8 encoded
+# Loading is two array.frombytes calls, one decode and a walk over the codes,
+# which is far cheaper than running the parser again. Each array uses the
+# narrowest typecode its largest value fits, recorded in the header, and the
+# native byte order since the cache never leaves the machine that wrote it.
+FORMAT_VERSION = 2
+MAGIC = b"SSGD"
+HEADER = struct.Struct("<4sHccIII")
+TYPECODES = ("B", "H", "I")
+
+BLOCK_TYPES = list(BlockType)
+BLOCK_TYPE_CODES = {block_type: code for code, block_type in enumerate(BLOCK_TYPES)}
+TEXT_TYPES = list(TextType)
+TEXT_TYPE_CODES = {text_type: code for code, text_type in enumerate(TEXT_TYPES)}
+URL_TEXT_TYPES = (TextType.LINK, TextType.IMAGE)
+# blocks stored as their text nodes alone
+LEAF_BLOCK_TYPES = frozenset(BlockType) - {BlockType.CODE, BlockType.QUOTE, *LIST_BLOCK_TYPES}
+
+def encode_document(document):
+    # nested blocks are walked with a stack of (iterator, whether it yields
+    # list items) rather than recursion, so deep nesting encodes too
+    codes = [len(document)]
+    strings = []
+    stack = [(iter(document), False)]
+    while stack:
+        iterator, is_items = stack[-1]
+        entry = next(iterator, None)
+        if entry is None:
+            stack.pop()
+        elif is_items:
+            nodes, nested = entry
+            encode_nodes(nodes, codes, strings)
+            codes.append(len(nested))
+            stack.append((iter(nested), False))
+        else:
+            block_type, payload = entry
+            codes.append(BLOCK_TYPE_CODES[block_type])
+            if block_type == BlockType.CODE:
+                strings.extend(payload)
+            elif block_type == BlockType.QUOTE:
+                codes.append(len(payload))
+                stack.append((iter(payload), False))
+            elif block_type in LIST_BLOCK_TYPES:
+                codes.append(len(payload))
+                stack.append((iter(payload), True))
+            else:
+                encode_nodes(payload, codes, strings)
+    codes = narrowest_array(codes)
+    lengths = narrowest_array([len(string) for string in strings])
+    text = ''.join(strings).encode()
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, codes.typecode.encode(), lengths.typecode.encode(),
+        len(codes), len(lengths), len(text),
+    )
+    return b"".join([header, codes.tobytes(), lengths.tobytes(), text])
+
+def narrowest_array(values):
+    largest = max(values, default=0)
+    for typecode in TYPECODES:
+        if largest < 1 << 8 * array(typecode).itemsize:
+            return array(typecode, values)
+    raise ValueError("parsed document too large to cache")
+
+def encode_nodes(nodes, codes, strings):
+    codes.append(len(nodes))
+    for node in nodes:
+        codes.append(TEXT_TYPE_CODES[node.text_type])
+        strings.append(node.text)
+        if node.text_type in URL_TEXT_TYPES:
+            strings.append(node.url)
+
+def decode_document(data):
+    # ValueError for anything that isn't a whole document in this format, so
+    # a truncated or damaged file is parsed again rather than misread
+    if len(data) < HEADER.size:
+        raise ValueError("truncated parsed document")
+    magic, version, code_type, length_type, code_count, string_count, text_size = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("unsupported parsed document format")
+    if code_type.decode("latin-1") not in TYPECODES or length_type.decode("latin-1") not in TYPECODES:
+        raise ValueError("corrupt parsed document")
+    codes = array(code_type.decode())
+    lengths = array(length_type.decode())
+    position = HEADER.size
+    codes_end = position + code_count * codes.itemsize
+    lengths_end = codes_end + string_count * lengths.itemsize
+    if len(data) != lengths_end + text_size:
+        raise ValueError("parsed document has the wrong size")
+    codes.frombytes(data[position:codes_end])
+    lengths.frombytes(data[codes_end:lengths_end])
+    text = data[lengths_end:].decode()
+    ends = list(accumulate(lengths))
+    if (ends[-1] if ends else 0) != len(text):
+        raise ValueError("corrupt parsed document")
+    strings = iter([text[start:end] for start, end in zip([0] + ends, ends)])
+    codes = iter(codes)
+    try:
+        document = decode_blocks(codes, strings)
+    except (StopIteration, IndexError):
+        raise ValueError("corrupt parsed document") from None
+    if next(codes, None) is not None or next(strings, None) is not None:
+        raise ValueError("corrupt parsed document")
+    return document
+
+def decode_blocks(codes, strings):
+    document = []
+    # [entries left, list they go to, whether they are list items]; a frame
+    # is left as soon as it reaches a quote or list, and resumed after it
+    stack = [[next(codes), document, False]]
+    while stack:
+        frame = stack[-1]
+        entries = frame[1]
+        while frame[0]:
+            frame[0] -= 1
+            if frame[2]:
+                nested = []
+                entries.append((decode_nodes(codes, strings), nested))
+                count = next(codes)
+                if count:
+                    stack.append([count, nested, False])
+                    break
+                continue
+            block_type = BLOCK_TYPES[next(codes)]
+            if block_type in LEAF_BLOCK_TYPES:
+                entries.append((block_type, decode_nodes(codes, strings)))
+            elif block_type == BlockType.CODE:
+                entries.append((block_type, (next(strings), next(strings))))
+            else:
+                payload = []
+                entries.append((block_type, payload))
+                count = next(codes)
+                if count:
+                    stack.append([count, payload, block_type != BlockType.QUOTE])
+                    break
+        else:
+            stack.pop()
+    return document
+
+def decode_nodes(codes, strings):
+    nodes = []
+    for _ in range(next(codes)):
+        text_type = TEXT_TYPES[next(codes)]
+        text = next(strings)
+        nodes.append(TextNode(text, text_type, next(strings) if text_type in URL_TEXT_TYPES else None))
+    return nodes
+
+class DocumentCache:
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, markdown):
+        digest = hash_bytes(f"{PARSER_VERSION}\0{markdown}".encode())
+        return os.path.join(self.directory, digest[:2], digest + ".bin")
+
+    def get_or_parse(self, markdown):
+        path = self.path_for(markdown)
+        try:
+            with open(path, "rb") as f:
+                document = decode_document(f.read())
+        except (FileNotFoundError, ValueError):
+            document = parse_document(markdown)
+            write_if_changed(path, encode_document(document))
+            self.misses += 1
+            return document
+        self.hits += 1
+        return document
+
+    def __repr__(self):
+        return f"DocumentCache({self.directory}, hits={self.hits}, misses={self.misses})"
+
+document_cache = None
+
+def enable_document_cache(directory):
+    global document_cache
+    document_cache = DocumentCache(directory) if directory is not None else None
+
+def document_cache_dir():
+    return document_cache.directory if document_cache is not None else None
+
+def parse_document_cached(markdown):
+    if document_cache is None:
+        return parse_document(markdown)
+    return document_cache.get_or_parse(markdown)
+
+def markdown_to_html_node_cached(markdown):
+    if document_cache is None:
+        return markdown_to_html_node(markdown)
+    return document_to_html_node(document_cache.get_or_parse(markdown))
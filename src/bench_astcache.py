@@ -0,0 +1,32 @@
+import sys
+import time
+from astcache import decode_document, encode_document
+from bench_build import PAGE
+from functions import parse_document
+from pages import find_markdown_files, page_variables, read_file
+
+def largest_documents(count):
+    # the biggest pages under content/, plus generated ones well past them
+    bodies = [page_variables(read_file(source))[1] for source in find_markdown_files("content")]
+    bodies.sort(key=len, reverse=True)
+    generated = [''.join(PAGE.format(index=index, previous=index - 1) for index in range(blocks)) for blocks in (50, 200, 800)]
+    return bodies[:count] + generated
+
+def best_of(function, argument, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main(repeat):
+    print(f"{'markdown':>10} {'cached':>10} {'parse':>10} {'load':>10} {'speedup':>8}")
+    for markdown in largest_documents(3):
+        data = encode_document(parse_document(markdown))
+        parse = best_of(parse_document, markdown, repeat)
+        load = best_of(decode_document, data, repeat)
+        print(f"{len(markdown.encode()):>9}B {len(data):>9}B {parse * 1000:>8.2f}ms {load * 1000:>8.2f}ms {parse / load:>7.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
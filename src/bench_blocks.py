@@ -0,0 +1,37 @@
+import sys
+import time
+from functions import block_to_block_type, block_to_block_type_reference
+
+def make_corpus(block_count):
+    blocks = []
+    for i in range(block_count):
+        match i % 6:
+            case 0:
+                blocks.append(f"## Heading {i}")
+            case 1:
+                blocks.append("```\n" + "code line\n" * 20 + "```")
+            case 2:
+                blocks.append("\n".join(f"> quoted line {j}" for j in range(10)))
+            case 3:
+                blocks.append("\n".join(f"* list item {j}" for j in range(10)))
+            case 4:
+                blocks.append("\n".join(f"{j}. list item" for j in range(1, 11)))
+            case 5:
+                blocks.append("A paragraph with some text\nspread over\nthree lines.")
+    return blocks
+
+def time_classifier(function, blocks):
+    start = time.perf_counter()
+    for block in blocks:
+        function(block)
+    return time.perf_counter() - start
+
+def main(block_count):
+    blocks = make_corpus(block_count)
+    print(f"corpus: {len(blocks)} blocks")
+    for function in [block_to_block_type, block_to_block_type_reference]:
+        elapsed = time_classifier(function, blocks)
+        print(f"  {function.__name__:<30} {elapsed:8.3f}s")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 60000)
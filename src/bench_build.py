@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+import time
+from build import generate_pages
+from manifest import BuildManifest
+
+PAGE = """# Page {index}
+
+Some **bold** and *italic* text with `code`, a [link](/pages/{previous}.html) and an ![image](/images/{index}.png).
+
+## Details
+
+* first item with a [link](https://foo.bar/{index})
+* second item
+* third item
+
+1. step one
+2. step two
+
+> a quote
+> over two lines
+
+```
+code sample {index}
+```
+"""
+
+def make_site(root, page_count, paragraphs_per_page):
+    content_dir = os.path.join(root, "content")
+    os.makedirs(os.path.join(content_dir, "pages"))
+    for index in range(page_count):
+        with open(os.path.join(content_dir, "pages", f"{index}.md"), "w") as f:
+            f.write(PAGE.format(index=index, previous=index - 1) * paragraphs_per_page)
+    template_path = os.path.join(root, "template.html")
+    with open(template_path, "w") as f:
+        f.write("<html><head><title>{{ Title }}</title></head><body>{{ Content }}</body></html>")
+    return content_dir, template_path
+
+def time_build(content_dir, template_path, dest_dir, jobs):
+    manifest = BuildManifest()
+    start = time.perf_counter()
+    generated = generate_pages(content_dir, template_path, dest_dir, manifest, jobs)
+    return time.perf_counter() - start, len(generated)
+
+def main(page_count, max_jobs):
+    with tempfile.TemporaryDirectory() as root:
+        content_dir, template_path = make_site(root, page_count, 5)
+        baseline = None
+        jobs = 1
+        while jobs <= max_jobs:
+            elapsed, generated = time_build(content_dir, template_path, os.path.join(root, f"public-{jobs}"), jobs)
+            baseline = baseline or elapsed
+            print(f"jobs {jobs:>3}: {elapsed:8.3f}s for {generated} pages ({baseline / elapsed:5.2f}x)")
+            jobs *= 2
+
+if __name__ == "__main__":
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    max_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    main(page_count, max_jobs)
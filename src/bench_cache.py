@@ -0,0 +1,44 @@
+import random
+import sys
+import time
+import functions
+from functions import enable_parse_caches, markdown_to_html_node
+
+# blocks every page shares, as footers, disclaimers and admonitions do
+SHARED_BLOCKS = [
+    "> **Note:** this page is part of the [user guide](/guide/index.html); see the [changelog](/changelog.html) for updates.",
+    "Copyright *Example Corp*. All rights reserved. Read our [privacy policy](/privacy.html) and [terms](/terms.html).",
+    "* [Home](/index.html)\n* [Guide](/guide/index.html)\n* [API](/api/index.html)\n* [Blog](/blog/index.html)",
+    "This documentation is provided **as is**, without warranty of any kind. Use `--help` for more options.",
+]
+
+def make_page(rng, index):
+    blocks = [f"# Page {index}", rng.choice(SHARED_BLOCKS)]
+    for paragraph in range(6):
+        if rng.random() < 0.5:
+            blocks.append(rng.choice(SHARED_BLOCKS))
+        else:
+            blocks.append(f"Paragraph {paragraph} of page {index} with **bold** text and a [link](/pages/{rng.randint(0, 999)}.html).")
+    blocks.extend(SHARED_BLOCKS[1:3])
+    return "\n\n".join(blocks)
+
+def time_render(pages):
+    start = time.perf_counter()
+    for page in pages:
+        markdown_to_html_node(page).to_html()
+    return time.perf_counter() - start
+
+def main(page_count, cache_size):
+    rng = random.Random(0)
+    pages = [make_page(rng, index) for index in range(page_count)]
+    enable_parse_caches(0)
+    print(f"uncached: {time_render(pages):8.3f}s for {page_count} pages")
+    enable_parse_caches(cache_size)
+    print(f"cached:   {time_render(pages):8.3f}s for {page_count} pages")
+    print(f"  inline {functions.inline_cache}")
+    print(f"  block  {functions.block_cache}")
+
+if __name__ == "__main__":
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    cache_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    main(page_count, cache_size)
@@ -0,0 +1,51 @@
+import html
+import sys
+import time
+from functions import markdown_to_html_node
+from leafnode import LeafNode
+
+PARAGRAPH = "See [the docs](https://foo.bar/docs) and [page {index}](/pages/{index}.html), **bold** text, `a < b` and ![a logo](/logo.png). "
+
+def unescaped_to_html(self):
+    # rendering before escaping was added, for comparison
+    if self.value is None:
+        raise ValueError()
+    if self.tag is None:
+        return self.value
+    if self.props is None:
+        return f"<{self.tag}>{self.value}</{self.tag}>"
+    return f"<{self.tag} {unescaped_props_to_html(self)}>{self.value}</{self.tag}>"
+
+def unescaped_props_to_html(self):
+    return ' '.join(list(map(lambda kvp: f"{kvp[0]}=\"{kvp[1]}\"", self.props.items())))
+
+def naive_to_html(self):
+    # html.escape on every value and attribute
+    if self.value is None:
+        raise ValueError()
+    value = html.escape(self.value, quote=False)
+    if self.tag is None:
+        return value
+    if self.props is None:
+        return f"<{self.tag}>{value}</{self.tag}>"
+    props = ' '.join(f"{name}=\"{html.escape(str(prop))}\"" for name, prop in self.props.items())
+    return f"<{self.tag} {props}>{value}</{self.tag}>"
+
+def time_render(pages):
+    start = time.perf_counter()
+    for page in pages:
+        markdown_to_html_node(page).to_html()
+    return time.perf_counter() - start
+
+def main(page_count):
+    pages = ['\n\n'.join(PARAGRAPH.format(index=index) * 20 for _ in range(5)) for index in range(page_count)]
+    escaped_to_html = LeafNode.to_html
+    for name, to_html in [("unescaped", unescaped_to_html), ("html.escape", naive_to_html), ("escaped", escaped_to_html)]:
+        LeafNode.to_html = to_html
+        try:
+            print(f"{name:<12} {time_render(pages):8.3f}s for {page_count} link-heavy pages")
+        finally:
+            LeafNode.to_html = escaped_to_html
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
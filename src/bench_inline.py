@@ -0,0 +1,27 @@
+import sys
+import time
+from functions import text_to_textnodes, text_to_textnodes_reference
+
+CORPORA = {
+    "mixed": "Some **bold** and *italic* text with `code`, a [link](https://foo.bar/baz) and an ![image](https://foo.bar/qux.png). ",
+    "links": "See [the docs](https://foo.bar/docs) or [the source](https://foo.bar/src) and ![a logo](https://foo.bar/logo.png). ",
+}
+
+def make_paragraph(sentence, size):
+    return sentence * (size // len(sentence) + 1)
+
+def time_call(function, text):
+    start = time.perf_counter()
+    nodes = function(text)
+    return time.perf_counter() - start, len(nodes)
+
+def main(size):
+    for name, sentence in CORPORA.items():
+        text = make_paragraph(sentence, size)
+        print(f"{name} paragraph: {len(text)} bytes")
+        for function in [text_to_textnodes, text_to_textnodes_reference]:
+            elapsed, node_count = time_call(function, text)
+            print(f"  {function.__name__:<30} {elapsed:8.3f}s {node_count} nodes")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1024 * 1024)
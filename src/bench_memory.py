@@ -0,0 +1,50 @@
+import sys
+import tracemalloc
+from leafnode import LeafNode
+from parentnode import ParentNode
+from textnode import TextNode, TextType, text_node_to_html_node
+
+# subclasses without __slots__ get a per-instance __dict__ again, which is
+# how the node classes were laid out before they were slotted
+class DictTextNode(TextNode):
+    pass
+
+class DictLeafNode(LeafNode):
+    pass
+
+class DictParentNode(ParentNode):
+    pass
+
+TEXT_TYPES = [TextType.TEXT, TextType.BOLD, TextType.ITALIC, TextType.CODE, TextType.LINK, TextType.IMAGE]
+
+def build_tree(paragraph_count, text_node_class, leaf_node_class, parent_node_class):
+    text_nodes = []
+    paragraphs = []
+    for i in range(paragraph_count):
+        children = []
+        for text_type in TEXT_TYPES:
+            text_node = text_node_class(f"text {i}", text_type, f"https://foo.bar/{i}")
+            html_node = text_node_to_html_node(text_node)
+            text_nodes.append(text_node)
+            children.append(leaf_node_class(html_node.tag, html_node.value, html_node.props))
+        paragraphs.append(parent_node_class("p", children))
+    return text_nodes, parent_node_class("div", paragraphs)
+
+def measure(paragraph_count, *classes):
+    tracemalloc.start()
+    text_nodes, tree = build_tree(paragraph_count, *classes)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, peak, len(text_nodes) + paragraph_count * (len(TEXT_TYPES) + 1) + 1
+
+def main(paragraph_count):
+    layouts = {
+        "__dict__": (DictTextNode, DictLeafNode, DictParentNode),
+        "__slots__": (TextNode, LeafNode, ParentNode),
+    }
+    for name, classes in layouts.items():
+        size, peak, node_count = measure(paragraph_count, *classes)
+        print(f"{name:<10} {node_count} nodes {size / node_count:8.1f} bytes/node (peak {peak / node_count:8.1f})")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
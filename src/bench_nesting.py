@@ -0,0 +1,81 @@
+import sys
+import time
+from functions import LIST_ITEM_PATTERN, BlockType, markdown_to_indented_blocks, parse_document, parse_indented_block
+
+def deep_quotes(depth, lines_per_level):
+    return '\n'.join(">" * level + f" level {level} line {line} with **bold** text" for level in range(1, depth + 1) for line in range(lines_per_level))
+
+def deep_lists(depth, items_per_level):
+    return '\n'.join("  " * level + f"- level {level} item {item} with **bold** text" for level in range(depth) for item in range(items_per_level))
+
+def naive_parse(markdown):
+    # nesting by running the whole parser again on each container's contents
+    # with one level of markers or indentation removed, for comparison
+    document = []
+    for block in markdown_to_indented_blocks(markdown):
+        lines = block.split('\n')
+        first = lines[0].lstrip()
+        if first.startswith(">"):
+            document.append((BlockType.QUOTE, naive_parse_quote(lines)))
+        elif LIST_ITEM_PATTERN.match(first):
+            document.append(naive_parse_list(lines))
+        else:
+            document.append(parse_indented_block(block))
+    return document
+
+def naive_parse_quote(lines):
+    # one marker comes off every line; runs of lines that still start with
+    # one, and runs that don't, are parsed again
+    quote = []
+    run = []
+    for line in [line.lstrip()[1:].removeprefix(" ") for line in lines] + [""]:
+        if run and (not line or line.lstrip().startswith(">") != run[0].lstrip().startswith(">")):
+            quote.extend(naive_parse('\n'.join(run)))
+            run = []
+        if line:
+            run.append(line)
+    return quote
+
+def naive_parse_list(lines):
+    # unordered lists only: items are the lines at the first line's indent,
+    # and the lines under an item are dedented and parsed again
+    indent = len(lines[0]) - len(lines[0].lstrip())
+    items = []
+    nested = []
+    for line in lines + [None]:
+        if line is not None and len(line) - len(line.lstrip()) > indent:
+            nested.append(line[indent + 2:])
+            continue
+        if nested:
+            items[-1][1].extend(naive_parse('\n'.join(nested)))
+            nested = []
+        if line is not None:
+            items.append((parse_indented_block(line[indent:])[1][0][0], []))
+    return BlockType.UNORDERED_LIST, items
+
+def best_of(function, argument, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main(repeat):
+    # the naive parser recurses once per level, so depths stay under the
+    # recursion limit here
+    print(f"{'document':<16} {'bytes':>9} {'one pass':>10} {'naive':>10} {'ns/byte':>8} {'naive ns/byte':>14}")
+    for name, make in [("quotes", deep_quotes), ("lists", deep_lists)]:
+        for depth in (25, 50, 100, 200):
+            markdown = make(depth, 4)
+            assert naive_parse(markdown) == parse_document(markdown), (name, depth)
+            one_pass = best_of(parse_document, markdown, repeat)
+            naive = best_of(naive_parse, markdown, repeat)
+            size = len(markdown.encode())
+            print(
+                f"{name + ' x' + str(depth):<16} {size:>9} {one_pass * 1000:>8.2f}ms {naive * 1000:>8.2f}ms "
+                f"{one_pass * 1e9 / size:>8.1f} {naive * 1e9 / size:>14.1f}"
+            )
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
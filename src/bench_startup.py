@@ -0,0 +1,76 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+# import time allowed for "main.py --help", which every command pays before
+# its handler runs; watch hooks and per-file ci calls live on this path
+DEFAULT_BUDGET_MS = 25.0
+
+# scenario -> arguments to the interpreter; "python" is the floor every
+# scenario starts from, the others import what the matching main.py
+# handler imports
+SCENARIOS = {
+    "python": ["-c", "pass"],
+    "cli": ["main.py", "--help"],
+    "check": ["-c", "import main, astcache, linkindex, manifest"],
+    "serve": ["-c", "import main, astcache, devserver, highlight, manifest"],
+    "build": ["-c", "import main, astcache, build, compress, functions, highlight, images, linkindex, manifest, searchindex, static"],
+}
+
+def parse_import_times(stderr):
+    # module -> (self, cumulative) microseconds from -X importtime output,
+    # and the total over top level imports
+    modules = {}
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_time), int(cumulative))
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total, modules
+
+def time_startup(arguments, repeat):
+    # best of repeat runs; the first run only writes bytecode caches, which
+    # some environments turn off through PYTHONDONTWRITEBYTECODE
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    command = [sys.executable, "-X", "importtime", *arguments]
+    subprocess.run(command, cwd=SRC_DIR, env=env, capture_output=True, check=True)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=SRC_DIR, env=env, capture_output=True, text=True, check=True)
+        wall = time.perf_counter() - start
+        total, modules = parse_import_times(result.stderr)
+        if best is None or total < best[1]:
+            best = (wall, total, modules)
+    return best
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Time interpreter startup and imports per command with -X importtime")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_MS, help="import time allowed for the cli, in ms")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per scenario")
+    parser.add_argument("--top", type=int, default=5, help="slowest modules listed per scenario")
+    args = parser.parse_args(argv)
+    cli_imports = None
+    for name, arguments in SCENARIOS.items():
+        wall, total, modules = time_startup(arguments, args.repeat)
+        print(f"{name:<8} {wall * 1000:8.1f} ms wall {total / 1000:8.1f} ms imports")
+        slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+        for module, (self_time, cumulative) in slowest:
+            print(f"    {module:<32} {self_time / 1000:6.1f} ms self {cumulative / 1000:6.1f} ms cumulative")
+        if name == "cli":
+            cli_imports = total / 1000
+    if cli_imports > args.budget:
+        print(f"OVER BUDGET cli imports take {cli_imports:.1f} ms, budget {args.budget:.1f} ms")
+        return 1
+    print(f"cli imports within the {args.budget:.1f} ms budget")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,220 @@
+import argparse
+import json
+import platform
+import sys
+import timeit
+from astcache import decode_document, encode_document
+from functions import (
+    block_to_block_type,
+    markdown_to_blocks,
+    markdown_to_html_node,
+    parse_document,
+    split_nodes_delimiter,
+    split_nodes_link,
+    text_to_textnodes,
+)
+from highlight import highlight
+from leafnode import LeafNode
+from parentnode import ParentNode
+from textnode import TextNode, TextType
+
+BASELINE_VERSION = 1
+DEFAULT_BASELINE_PATH = "bench_baseline.json"
+DEFAULT_THRESHOLD = 0.25
+
+def link_heavy_paragraph(link_count):
+    return ''.join(
+        f"see [link {i}](https://foo.bar/{i}) and **bold {i}** then ![image {i}](/images/{i}.png) "
+        for i in range(link_count))
+
+def nested_list_document(depth, items_per_level):
+    lines = []
+    for level in range(depth):
+        for item in range(items_per_level):
+            lines.append("  " * level + f"* level {level} item {item} with *some* text")
+    return '\n'.join(lines)
+
+def deep_quote_document(depth, lines_per_level):
+    return '\n'.join(">" * level + f" level {level} line {line} with *some* text" for level in range(1, depth + 1) for line in range(lines_per_level))
+
+def huge_code_block(line_count):
+    return "```python\n" + ''.join(f"value_{i} = compute({i}) * 2  # comment\n" for i in range(line_count)) + "```"
+
+def site_pages(page_count):
+    return [
+        f"# Page {i}\n\nIntro with **bold** and a [link](/pages/{i - 1}.html).\n\n"
+        f"* item one\n* item [two](/two.html)\n\n1. first\n2. second\n\n"
+        f"> a quote\n> continues\n\n```\ncode {i}\n```\n\nClosing paragraph with `code`."
+        for i in range(page_count)]
+
+def nested_tree(depth):
+    node = LeafNode("b", "leaf")
+    for _ in range(depth):
+        node = ParentNode("div", [LeafNode(None, "text"), node])
+    return node
+
+def wide_tree(width):
+    return ParentNode("ul", [ParentNode("li", [LeafNode("a", f"item {i}", {"href": f"/{i}"})]) for i in range(width)])
+
+def split_delimiter_link_heavy():
+    nodes = [TextNode(link_heavy_paragraph(5000), TextType.TEXT)]
+    return lambda: split_nodes_delimiter(nodes, "**", TextType.BOLD)
+
+def split_complex_link_heavy():
+    nodes = [TextNode(link_heavy_paragraph(5000).replace("!", ""), TextType.TEXT)]
+    return lambda: split_nodes_link(nodes)
+
+def inline_link_heavy():
+    text = link_heavy_paragraph(5000)
+    return lambda: text_to_textnodes(text)
+
+def blocks_nested_lists():
+    text = '\n\n'.join(nested_list_document(50, 20) for _ in range(20))
+    return lambda: markdown_to_blocks(text)
+
+def blocks_huge_code_block():
+    text = huge_code_block(50000)
+    return lambda: markdown_to_blocks(text)
+
+def classify_nested_lists():
+    blocks = [nested_list_document(50, 20)] * 20
+    return lambda: [block_to_block_type(block) for block in blocks]
+
+def classify_huge_code_block():
+    block = huge_code_block(50000)
+    return lambda: block_to_block_type(block)
+
+def highlight_python():
+    code = huge_code_block(5000)[len("```python\n"):-3]
+    return lambda: highlight("python", code)
+
+def parse_site_document():
+    text = '\n\n'.join(site_pages(500))
+    return lambda: parse_document(text)
+
+def parse_deep_quotes():
+    text = deep_quote_document(500, 2)
+    return lambda: parse_document(text)
+
+def parse_nested_lists():
+    text = '\n\n'.join(nested_list_document(50, 20) for _ in range(20))
+    return lambda: parse_document(text)
+
+def render_deep_quotes():
+    text = deep_quote_document(500, 2)
+    return lambda: markdown_to_html_node(text).to_html()
+
+def load_site_document():
+    data = encode_document(parse_document('\n\n'.join(site_pages(500))))
+    return lambda: decode_document(data)
+
+def to_html_deep_nesting():
+    tree = nested_tree(5000)
+    return lambda: tree.to_html()
+
+def to_html_wide():
+    tree = wide_tree(20000)
+    return lambda: tree.to_html()
+
+def to_html_link_heavy():
+    tree = markdown_to_html_node('\n\n'.join([link_heavy_paragraph(50)] * 100))
+    return lambda: tree.to_html()
+
+def render_site():
+    pages = site_pages(10000)
+    return lambda: [markdown_to_html_node(page).to_html() for page in pages]
+
+# name -> setup function returning the zero-argument callable to time; the
+# corpora are generated deterministically so runs on one machine compare
+BENCHMARKS = {
+    "split_nodes_delimiter/link-heavy": split_delimiter_link_heavy,
+    "split_nodes_complex/link-heavy": split_complex_link_heavy,
+    "text_to_textnodes/link-heavy": inline_link_heavy,
+    "markdown_to_blocks/nested-lists": blocks_nested_lists,
+    "markdown_to_blocks/huge-code-block": blocks_huge_code_block,
+    "block_to_block_type/nested-lists": classify_nested_lists,
+    "block_to_block_type/huge-code-block": classify_huge_code_block,
+    "highlight/python": highlight_python,
+    "parse_document/500-pages": parse_site_document,
+    "decode_document/500-pages": load_site_document,
+    "parse_document/deep-quotes": parse_deep_quotes,
+    "parse_document/nested-lists": parse_nested_lists,
+    "markdown_to_html_node/deep-quotes": render_deep_quotes,
+    "ParentNode.to_html/deep-nesting": to_html_deep_nesting,
+    "ParentNode.to_html/wide": to_html_wide,
+    "ParentNode.to_html/link-heavy": to_html_link_heavy,
+    "site/10k-pages": render_site,
+}
+
+def run_benchmarks(names, repeat):
+    results = {}
+    for name in names:
+        timer = timeit.Timer(BENCHMARKS[name]())
+        # loop fast benchmarks enough to be measurable, then keep the best of
+        # several runs since the minimum is the least noisy estimate
+        number, _ = timer.autorange()
+        results[name] = min(timer.repeat(repeat, number)) / number
+        print(f"{name:<40} {results[name] * 1000:12.4f} ms", flush=True)
+    return results
+
+def compare_results(results, baseline, threshold):
+    regressions = []
+    for name, seconds in results.items():
+        if name not in baseline:
+            continue
+        ratio = seconds / baseline[name]
+        if ratio > 1 + threshold:
+            regressions.append((name, baseline[name], seconds, ratio))
+    return regressions
+
+def load_baseline(path):
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version") != BASELINE_VERSION:
+        raise Exception(f"unsupported benchmark baseline version: {data.get('version')}")
+    return data["results"]
+
+def save_baseline(path, results):
+    with open(path, "w") as f:
+        json.dump({
+            "version": BASELINE_VERSION,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def merge_baseline(path, results):
+    # a filtered run only replaces the entries it measured
+    try:
+        baseline = load_baseline(path)
+    except FileNotFoundError:
+        baseline = {}
+    return {**baseline, **results}
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Time the parsing and rendering hot paths against a stored baseline")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="store this run's results in the baseline, keeping the entries of benchmarks not run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown before failing, as a fraction")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    args = parser.parse_args(argv)
+    names = [name for name in BENCHMARKS if args.filter in name]
+    results = run_benchmarks(names, args.repeat)
+    if args.save:
+        save_baseline(args.baseline, merge_baseline(args.baseline, results))
+        print(f"saved {len(results)} results to {args.baseline}")
+        return 0
+    try:
+        baseline = load_baseline(args.baseline)
+    except FileNotFoundError:
+        print(f"no baseline at {args.baseline}; run with --save to create one")
+        return 0
+    regressions = compare_results(results, baseline, args.threshold)
+    for name, before, after, ratio in regressions:
+        print(f"REGRESSION {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,50 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from astcache import document_cache_dir
+from depgraph import explain_page, page_inputs, record_page, site_outputs, static_outputs
+from functions import parse_cache_maxsize
+from highlight import highlight_cache_dir
+from output import OutputQueue
+from pages import dest_path_for, find_markdown_files, generate_page_from_worker, init_worker, queue_page_from_worker, set_worker_template
+from template import load_template
+from textnode import current_image_variants
+
+def generate_pages(content_dir, template_path, dest_dir, manifest, jobs = 1, reasons = None, documents = None):
+    # rebuild only pages with a changed edge in the dependency graph recorded
+    # by the last build, and remove pages whose source is gone; reasons, when
+    # given, maps each rebuilt output to why it was rebuilt, and documents
+    # gets the page_document of each page rendered in this process
+    template = load_template(template_path)
+    template_inputs = {path: manifest.digest(path) for path in template.dependencies}
+    sources = find_markdown_files(content_dir)
+    outputs = site_outputs(sources, content_dir, dest_dir, manifest)
+    static_sources = static_outputs(dest_dir, manifest)
+    stale_pages = []
+    for source in sources:
+        dest = dest_path_for(source, content_dir, dest_dir)
+        inputs = page_inputs(manifest, source, dest, dest_dir, template_inputs, static_sources)
+        page_reasons = explain_page(manifest.pages.get(source), source, dest, inputs, outputs)
+        if page_reasons:
+            stale_pages.append((source, dest, inputs))
+            if reasons is not None:
+                reasons[dest] = page_reasons
+    stale_sources = [page[0] for page in stale_pages]
+    stale_dests = [page[1] for page in stale_pages]
+    if jobs > 1 and len(stale_pages) > 1:
+        # workers get paths only and write their own outputs, so nothing but
+        # file names crosses the process boundary
+        chunk_size = max(1, len(stale_pages) // (jobs * 4))
+        with ProcessPoolExecutor(jobs, initializer=init_worker, initargs=(template, parse_cache_maxsize(), document_cache_dir(), highlight_cache_dir(), current_image_variants())) as executor:
+            list(executor.map(generate_page_from_worker, stale_sources, stale_dests, chunksize=chunk_size))
+    else:
+        set_worker_template(template)
+        with OutputQueue() as output:
+            for source, dest in zip(stale_sources, stale_dests):
+                queue_page_from_worker(output, source, dest, documents)
+    for source, dest, inputs in stale_pages:
+        record_page(manifest, source, dest, dest_dir, inputs, outputs)
+    for source in set(manifest.pages) - set(sources):
+        dest = manifest.forget_page(source)["dest"]
+        if os.path.exists(dest):
+            os.remove(dest)
+    return stale_dests
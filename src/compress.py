@@ -0,0 +1,122 @@
+import gzip
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from manifest import hash_bytes
+from output import write_if_changed
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (".html", ".css", ".js", ".json", ".svg", ".xml", ".txt")
+DEFAULT_COMPRESS_LEVEL = 6
+
+# elements whose whitespace is significant, and tags, which are kept verbatim
+# so attribute values never change
+HTML_VERBATIM_PATTERN = re.compile(r"<(pre|textarea|script|style)\b.*?</\1\s*>|<[^>]*>", re.DOTALL | re.IGNORECASE)
+# only ascii whitespace: a no-break space renders differently from a space
+WHITESPACE_RUN_PATTERN = re.compile(r"[ \t\n\r\f]{2,}|[\t\r\f]")
+CSS_TOKEN_PATTERN = re.compile(r"(\"(?:[^\"\\\n]|\\.)*\"|'(?:[^'\\\n]|\\.)*')|/\*.*?\*/|[ \t\n\r\f]+", re.DOTALL)
+# whitespace next to these never matters in css; ':' and '+' are left alone
+# since "a :hover" and calc(1px + 2px) need their spaces
+CSS_PUNCTUATION = "{};,>"
+
+class CompressStats:
+    def __init__(self):
+        self.compressed_files = 0
+        self.skipped_files = 0
+        self.bytes = 0
+        self.gzip_bytes = 0
+
+    def __repr__(self):
+        return (
+            f"compressed {self.compressed_files} files ({self.bytes} -> {self.gzip_bytes} gzip bytes), "
+            f"skipped {self.skipped_files} unchanged"
+        )
+
+def collapse_whitespace(match):
+    return "\n" if "\n" in match.group() else " "
+
+def minify_html(html):
+    # a run of whitespace in text renders as a single space, so runs collapse
+    # to one character outside the verbatim parts
+    parts = []
+    position = 0
+    for match in HTML_VERBATIM_PATTERN.finditer(html):
+        parts.append(WHITESPACE_RUN_PATTERN.sub(collapse_whitespace, html[position:match.start()]))
+        parts.append(match.group())
+        position = match.end()
+    parts.append(WHITESPACE_RUN_PATTERN.sub(collapse_whitespace, html[position:]))
+    return ''.join(parts)
+
+def minify_css(css):
+    def replace(match):
+        if match.group(1) is not None:
+            return match.group(1)
+        if match.group().startswith("/*"):
+            return ""
+        before = css[match.start() - 1] if match.start() > 0 else "{"
+        after = css[match.end()] if match.end() < len(css) else "}"
+        return "" if before in CSS_PUNCTUATION or after in CSS_PUNCTUATION else " "
+    return CSS_TOKEN_PATTERN.sub(replace, css).strip()
+
+MINIFIERS = {".html": minify_html, ".css": minify_css}
+
+def compressed_paths(path):
+    return [path + ".gz"] + ([path + ".br"] if brotli is not None else [])
+
+def compress_file(path, recorded_digest, level):
+    # returns (digest of the output, bytes, gzip bytes or None if skipped);
+    # outputs are minified when written, so this only ever reads them
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hash_bytes(data)
+    if digest == recorded_digest and all(map(os.path.exists, compressed_paths(path))):
+        return digest, len(data), None
+    compressed = gzip.compress(data, level, mtime=0)
+    write_if_changed(path + ".gz", compressed)
+    if brotli is not None:
+        write_if_changed(path + ".br", brotli.compress(data, quality=level))
+    return digest, len(data), len(compressed)
+
+def find_compressible_files(dest_dir):
+    paths = []
+    for dir_path, dir_names, file_names in os.walk(dest_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            if file_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                paths.append(os.path.join(dir_path, file_name))
+    return paths
+
+def compress_outputs(dest_dir, manifest, level = DEFAULT_COMPRESS_LEVEL, jobs = 1):
+    # precompress every text output, skipping files whose bytes hash to what
+    # the last build compressed; siblings of outputs that are gone are
+    # removed. Pages and static files are minified as they are written, see
+    # render_template and sync_static
+    stats = CompressStats()
+    paths = find_compressible_files(dest_dir)
+    recorded = [manifest.compressed.get(path) for path in paths]
+    levels = [level] * len(paths)
+    if jobs > 1 and len(paths) > 1:
+        chunk_size = max(1, len(paths) // (jobs * 4))
+        with ProcessPoolExecutor(jobs) as executor:
+            results = list(executor.map(compress_file, paths, recorded, levels, chunksize=chunk_size))
+    else:
+        results = list(map(compress_file, paths, recorded, levels))
+    compressed = {}
+    for path, (digest, size, gzip_size) in zip(paths, results):
+        compressed[path] = digest
+        if gzip_size is None:
+            stats.skipped_files += 1
+            continue
+        stats.compressed_files += 1
+        stats.bytes += size
+        stats.gzip_bytes += gzip_size
+    for path in set(manifest.compressed) - set(compressed):
+        for sibling in (path + ".gz", path + ".br"):
+            if os.path.exists(sibling):
+                os.remove(sibling)
+    manifest.compressed = compressed
+    return stats
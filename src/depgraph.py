@@ -0,0 +1,100 @@
+import os
+from functions import PARSER_VERSION, RENDERER_VERSION
+from highlight import HIGHLIGHTER_VERSION
+from htmlnode import render_props
+from linkindex import output_page, page_references, resolve_url
+from textnode import current_image_variants
+
+# The dependency graph lives in the manifest's page records: each page points
+# at the files read to render it (source, template and partials, by digest)
+# and at the pages and assets it references (by whether they existed). A page
+# is dirty exactly when one of those edges changed, and the reverse edges tell
+# watch mode which pages a changed file can affect. The versions of the code
+# that renders pages are inputs too, so bumping one renders every page again.
+
+# pseudo inputs of every page: name -> version; the names are not paths, so
+# watch mode never sees them change
+RENDER_VERSIONS = {
+    "version:parser": str(PARSER_VERSION),
+    "version:renderer": str(RENDERER_VERSION),
+    "version:highlighter": str(HIGHLIGHTER_VERSION),
+}
+
+def site_outputs(sources, content_dir, dest_dir, manifest):
+    # output paths relative to the site root that the current build produces,
+    # known without walking dest_dir
+    outputs = {os.path.splitext(os.path.relpath(source, content_dir))[0].replace(os.sep, "/") + ".html" for source in sources}
+    outputs.update(output_page(dest, dest_dir) for dest in manifest.static)
+    return outputs
+
+def static_outputs(dest_dir, manifest):
+    # output path relative to the site root -> static file copied there
+    return {output_page(dest, dest_dir): source for dest, source in manifest.static.items()}
+
+def page_inputs(manifest, source, dest, dest_dir, template_inputs, static_sources):
+    # the files a page is rendered from: its source, the template and its
+    # partials, and the static images it shows; plus RENDER_VERSIONS and,
+    # under "image:" and the url, the attributes the image stage gave each
+    # image, so a page rendered before they were known is rendered again
+    inputs = {source: manifest.digest(source), **template_inputs, **RENDER_VERSIONS}
+    variants = current_image_variants()
+    page = output_page(dest, dest_dir)
+    for url in page_references(source, manifest)[2]:
+        path = static_sources.get(resolve_url(page, url))
+        if path is not None:
+            inputs[path] = manifest.digest(path)
+        attributes = variants.get(url)
+        if attributes is not None:
+            inputs["image:" + url] = render_props(attributes)
+    return inputs
+
+def target_exists(target, outputs):
+    return target in outputs or target + "/index.html" in outputs
+
+def reference_targets(page, urls, outputs):
+    targets = {}
+    for url in urls:
+        target = resolve_url(page, url)
+        if target is not None and target != page:
+            targets[target] = target_exists(target, outputs)
+    return targets
+
+def record_page(manifest, source, dest, dest_dir, inputs, outputs):
+    _, link_urls, image_urls = page_references(source, manifest)
+    page = output_page(dest, dest_dir)
+    links = reference_targets(page, link_urls, outputs)
+    assets = reference_targets(page, image_urls, outputs)
+    manifest.record_page(source, dest, inputs, links, assets)
+
+def explain_page(record, source, dest, inputs, outputs):
+    # the reasons a page must be rendered again, empty if it is current
+    if record is None:
+        return ["new page"]
+    reasons = []
+    if record["dest"] != dest or not os.path.exists(dest):
+        reasons.append("output missing")
+    recorded_inputs = record["inputs"]
+    for path, digest in inputs.items():
+        if path not in recorded_inputs:
+            reasons.append(f"{path} added")
+        elif recorded_inputs[path] != digest:
+            reasons.append("source changed" if path == source else f"{path} changed")
+    reasons.extend(f"{path} removed" for path in recorded_inputs if path not in inputs)
+    for kind, targets in (("linked page", record["links"]), ("image", record["assets"])):
+        for target, existed in targets.items():
+            if target_exists(target, outputs) != existed:
+                reasons.append(f"{kind} {target} {'removed' if existed else 'added'}")
+    return reasons
+
+def dependent_pages(pages, paths, targets):
+    # reverse edges: sources that read one of paths while rendering or
+    # reference one of the output targets; a directory-style reference
+    # "blog" depends on "blog/index.html"
+    targets = set(targets)
+    targets.update(target[:-len("/index.html")] for target in list(targets) if target.endswith("/index.html"))
+    return {
+        source for source, record in pages.items()
+        if not paths.isdisjoint(record["inputs"])
+        or not targets.isdisjoint(record["links"])
+        or not targets.isdisjoint(record["assets"])
+    }
@@ -0,0 +1,152 @@
+import functools
+import http.server
+import os
+import threading
+import time
+from build import generate_pages
+from depgraph import dependent_pages, page_inputs, record_page, site_outputs, static_outputs
+from images import process_images
+from linkindex import output_page, page_references
+from pages import dest_path_for, find_markdown_files, page_document, read_file, render_document, write_page
+from static import sync_static
+from template import load_template
+from textnode import current_image_variants
+from watcher import create_watcher
+
+class DevSite:
+    def __init__(self, content_dir, template_path, static_dir, dest_dir, manifest, image_cache_dir):
+        self.content_dir = content_dir
+        self.template_path = os.path.normpath(template_path)
+        self.static_dir = static_dir
+        self.dest_dir = dest_dir
+        self.manifest = manifest
+        self.image_cache_dir = image_cache_dir
+        self.template = None
+        self.template_inputs = None
+        self.outputs = None
+        # source path -> (page variables, ParentNode), so a template change
+        # re-renders without parsing markdown again
+        self.documents = {}
+
+    def build(self):
+        sync_static(self.static_dir, self.dest_dir, self.manifest, minify=True)
+        self.process_images()
+        generate_pages(self.content_dir, self.template_path, self.dest_dir, self.manifest, documents=self.documents)
+        # pages that were already current are loaded too, through the
+        # document cache, so no template change has to parse markdown
+        for source in find_markdown_files(self.content_dir):
+            if source not in self.documents:
+                self.documents[source] = page_document(read_file(source))
+        self.load_template()
+        self.update_outputs()
+
+    def process_images(self):
+        # runs the image stage as a build does, and returns the sources of
+        # pages showing an image whose attributes changed; their documents
+        # hold the old attributes, so they are dropped
+        before = current_image_variants()
+        process_images(self.content_dir, self.dest_dir, self.manifest, self.image_cache_dir)
+        after = current_image_variants()
+        changed = {url for url in before.keys() | after.keys() if before.get(url) != after.get(url)}
+        if not changed:
+            return set()
+        sources = {source for source in self.manifest.pages if not changed.isdisjoint(page_references(source, self.manifest)[2])}
+        for source in sources:
+            self.documents.pop(source, None)
+        return sources
+
+    def load_template(self):
+        self.template = load_template(self.template_path)
+        self.template_inputs = {path: self.manifest.digest(path) for path in self.template.dependencies}
+
+    def update_outputs(self):
+        self.outputs = site_outputs(find_markdown_files(self.content_dir), self.content_dir, self.dest_dir, self.manifest)
+
+    def apply_changes(self, paths):
+        if None in paths:
+            # the watcher lost track of events; fall back to a full incremental build
+            self.documents.clear()
+            self.build()
+            return
+        if not paths.isdisjoint(self.template.dependencies):
+            self.load_template()
+        # pages that read a changed file, plus pages referencing an output
+        # that appeared or disappeared
+        sources = dependent_pages(self.manifest.pages, paths, ())
+        targets = set()
+        static_changed = False
+        content_changed = False
+        for path in paths:
+            if is_under(path, self.content_dir) and path.endswith(".md"):
+                content_changed = True
+                self.documents.pop(path, None)
+                sources.add(path)
+                dest = dest_path_for(path, self.content_dir, self.dest_dir)
+                if os.path.exists(path) != (path in self.manifest.pages):
+                    targets.add(output_page(dest, self.dest_dir))
+            elif is_under(path, self.static_dir):
+                static_changed = True
+                dest = os.path.join(self.dest_dir, os.path.relpath(path, self.static_dir))
+                if os.path.exists(path) != (dest in self.manifest.static):
+                    targets.add(output_page(dest, self.dest_dir))
+        if static_changed:
+            sync_static(self.static_dir, self.dest_dir, self.manifest, minify=True)
+        if static_changed or content_changed:
+            # pages may show a new image, or an image's size may have changed
+            sources |= self.process_images()
+        self.update_outputs()
+        sources |= dependent_pages(self.manifest.pages, set(), targets)
+        for source in sorted(sources):
+            self.render_source(source)
+
+    def render_source(self, source):
+        if not os.path.exists(source):
+            if source in self.manifest.pages:
+                dest = self.manifest.forget_page(source)["dest"]
+                if os.path.exists(dest):
+                    os.remove(dest)
+            self.documents.pop(source, None)
+            return
+        document = self.documents.get(source)
+        if document is None:
+            document = page_document(read_file(source))
+            self.documents[source] = document
+        dest = dest_path_for(source, self.content_dir, self.dest_dir)
+        write_page(dest, render_document(document, self.template))
+        inputs = page_inputs(self.manifest, source, dest, self.dest_dir, self.template_inputs, static_outputs(self.dest_dir, self.manifest))
+        record_page(self.manifest, source, dest, self.dest_dir, inputs, self.outputs)
+
+def is_under(path, dir_path):
+    return os.path.commonpath([os.path.abspath(path), os.path.abspath(dir_path)]) == os.path.abspath(dir_path)
+
+def start_server(directory, port):
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(("", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def serve(site, port, watch):
+    site.build()
+    site.manifest.save()
+    server = start_server(site.dest_dir, port)
+    print(f"serving {site.dest_dir} at http://localhost:{server.server_address[1]}/")
+    if not watch:
+        threading.Event().wait()
+    watcher = create_watcher([site.content_dir, site.static_dir], site.template.dependencies)
+    print(f"watching with {type(watcher).__name__}")
+    try:
+        while True:
+            changes = watcher.wait()
+            if not changes:
+                continue
+            start = time.perf_counter()
+            try:
+                site.apply_changes(changes)
+            except Exception as e:
+                print(f"rebuild failed: {e}")
+                continue
+            site.manifest.save()
+            print(f"rebuilt {len(changes)} changed files in {(time.perf_counter() - start) * 1000:.1f}ms")
+    finally:
+        watcher.close()
+        server.shutdown()
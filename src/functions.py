@@ -1,5 +1,11 @@
 import re
-from textnode import TextNode, TextType
+from highlight import highlight_code
+from htmlnode import escape_attribute
+from textnode import TextNode, TextType, freeze_text_node, text_node_to_html_node
+from leafnode import LeafNode
+from parentnode import ParentNode
+from rawnode import RawNode
+from lrucache import LRUCache
 from enum import Enum
 
 def split_nodes_delimiter(nodes, delimiter, text_type):
@@ -20,43 +26,112 @@ def split_nodes_delimiter(nodes, delimiter, text_type):
                 new_nodes.append(TextNode(sections[i], TextType.TEXT))
     return new_nodes
 
+# link text may hold one level of balanced brackets and urls one level of
+# balanced parentheses, e.g. [a [b] c](https://foo.bar/baz_(qux)); the
+# unrolled "plain* (group plain*)*" form has a single way to match any
+# input, so a failed match can't backtrack exponentially
+LINK_TEXT = r"\[([^\[\]\n]*(?:\[[^\[\]\n]*\][^\[\]\n]*)*)\]"
+LINK_URL = r"\(([^()\n]*(?:\([^()\n]*\)[^()\n]*)*)\)"
+IMAGE_PATTERN = re.compile("!" + LINK_TEXT + LINK_URL)
+LINK_PATTERN = re.compile("(?<!!)" + LINK_TEXT + LINK_URL)
+INLINE_DELIMITER_PATTERN = re.compile(r"\*\*|\*|`")
+HEADING_PATTERN = re.compile(r"(#{1,6}) ")
+CODE_BLOCK_PATTERN = re.compile(r"```.*```$", re.DOTALL)
+UNORDERED_LIST_ITEM_PATTERN = re.compile(r"[*-] ")
+ORDERED_LIST_ITEM_PATTERN = re.compile(r"(\d{1,})[.] ")
+BLANK_LINES_PATTERN = re.compile(r"\n{2,}")
+LIST_ITEM_PATTERN = re.compile(r"[*-] |(\d{1,})[.] ")
+# the ">" markers opening a quote line, each with an optional space after it
+QUOTE_MARKERS_PATTERN = re.compile(r"(?: *> ?)+")
+QUOTE_MARKER_PATTERN = re.compile(r"^ *> ?", re.MULTILINE)
+NESTED_QUOTE_PATTERN = re.compile(r"^ *> ? *>", re.MULTILINE)
+# blocks hold no empty lines, so whitespace after a newline is indentation
+INDENTED_LINE_PATTERN = re.compile(r"\n\s")
+
 def extract_markdown_images(text):
-    return re.findall(r"!\[(.*?)\]\((.*?)\)", text)
+    return IMAGE_PATTERN.findall(text)
 
 def extract_markdown_links(text):
-    return re.findall(r"(?<!!)\[(.*?)\]\((.*?)\)", text)
+    return LINK_PATTERN.findall(text)
 
 def split_nodes_link(nodes):
-    return split_nodes_complex(
-        nodes,
-        extract_markdown_links,
-        lambda link_tuple: f"[{link_tuple[0]}]({link_tuple[1]})",
-        TextType.LINK)
+    return split_nodes_complex(nodes, LINK_PATTERN, TextType.LINK)
 
 def split_nodes_image(nodes):
-    return split_nodes_complex(
-        nodes,
-        extract_markdown_images,
-        lambda image_tuple: f"![{image_tuple[0]}]({image_tuple[1]})",
-        TextType.IMAGE)
+    return split_nodes_complex(nodes, IMAGE_PATTERN, TextType.IMAGE)
 
-def split_nodes_complex(nodes, extract_function, split_delimiter_function, text_type):
+def split_nodes_complex(nodes, pattern, text_type):
     new_nodes = []
     for node in nodes:
         if node.text_type != TextType.TEXT:
             new_nodes.append(node)
             continue
-        remaining_text = node.text
-        markdown_items = extract_function(remaining_text)
-        for tuple in markdown_items:
-            sections = remaining_text.split(split_delimiter_function(tuple), 1)
-            remaining_text = sections[1]
-            new_nodes.append(TextNode(sections[0], TextType.TEXT))
-            new_nodes.append(TextNode(tuple[0], text_type, tuple[1]))
-        new_nodes.append(TextNode(remaining_text, TextType.TEXT))
+        # slice between match spans instead of re-splitting the remaining text
+        position = 0
+        for match in pattern.finditer(node.text):
+            new_nodes.append(TextNode(node.text[position:match.start()], TextType.TEXT))
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            position = match.end()
+        new_nodes.append(TextNode(node.text[position:], TextType.TEXT))
     return list(filter(lambda node: node.text != "", new_nodes))
 
 def text_to_textnodes(text):
+    # single left-to-right scan equivalent to text_to_textnodes_reference:
+    # "**" spans win over "*" spans, which win over "`" spans, and only the
+    # plain text between delimiters is searched for images and then links
+    nodes = []
+    span_type = TextType.TEXT
+    span_start = 0
+    for match in INLINE_DELIMITER_PATTERN.finditer(text):
+        delimiter = match.group()
+        if span_type == TextType.BOLD and delimiter != "**":
+            continue
+        if span_type == TextType.ITALIC and delimiter == "`":
+            continue
+        if span_type == TextType.TEXT:
+            append_text_with_images_and_links(nodes, text, span_start, match.start())
+            span_type = INLINE_DELIMITER_TYPES[delimiter]
+        elif INLINE_DELIMITER_TYPES[delimiter] == span_type:
+            if match.start() > span_start:
+                nodes.append(TextNode(text[span_start:match.start()], span_type))
+            span_type = TextType.TEXT
+        else:
+            # a stronger delimiter cut an open span; let the reference
+            # implementation raise the same error the chained passes would
+            return text_to_textnodes_reference(text)
+        span_start = match.end()
+    if span_type != TextType.TEXT:
+        return text_to_textnodes_reference(text)
+    append_text_with_images_and_links(nodes, text, span_start, len(text))
+    return nodes
+
+INLINE_DELIMITER_TYPES = {
+    "**": TextType.BOLD,
+    "*": TextType.ITALIC,
+    "`": TextType.CODE,
+}
+
+def append_text_with_images_and_links(nodes, text, start, end):
+    position = start
+    for match in IMAGE_PATTERN.finditer(text, start, end):
+        append_text_with_links(nodes, text, position, match.start())
+        if match.group(1) != "":
+            nodes.append(TextNode(match.group(1), TextType.IMAGE, match.group(2)))
+        position = match.end()
+    append_text_with_links(nodes, text, position, end)
+
+def append_text_with_links(nodes, text, start, end):
+    position = start
+    for match in LINK_PATTERN.finditer(text, start, end):
+        if match.start() > position:
+            nodes.append(TextNode(text[position:match.start()], TextType.TEXT))
+        if match.group(1) != "":
+            nodes.append(TextNode(match.group(1), TextType.LINK, match.group(2)))
+        position = match.end()
+    if end > position:
+        nodes.append(TextNode(text[position:end], TextType.TEXT))
+
+def text_to_textnodes_reference(text):
     nodes = [TextNode(text, TextType.TEXT)]
     nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
     nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
@@ -66,10 +141,19 @@ def text_to_textnodes(text):
 
 def markdown_to_blocks(markdown):
     stripped_markdown = '\n'.join(map(str.strip, markdown.split('\n')))
-    blocks = re.split("\n{2,}", stripped_markdown)
+    blocks = BLANK_LINES_PATTERN.split(stripped_markdown)
     blocks = list(filter(lambda block: block != "", blocks))
     return list(map(str.strip, blocks))
 
+def markdown_to_indented_blocks(markdown):
+    # markdown_to_blocks, but lines keep their indentation, which is what
+    # places a list inside another
+    stripped_markdown = '\n'.join(map(str.rstrip, markdown.split('\n'))).strip('\n')
+    return BLANK_LINES_PATTERN.split(stripped_markdown) if stripped_markdown else []
+
+def is_indented(block):
+    return block[0].isspace() or INDENTED_LINE_PATTERN.search(block) is not None
+
 class BlockType(Enum):
     H1 = "h1"
     H2 = "h2"
@@ -83,7 +167,45 @@ class BlockType(Enum):
     ORDERED_LIST = "ol"
     PARAGRAPH = "p"
 
+HEADING_BLOCK_TYPES = (None, BlockType.H1, BlockType.H2, BlockType.H3, BlockType.H4, BlockType.H5, BlockType.H6)
+
 def block_to_block_type(block):
+    regex_match = HEADING_PATTERN.match(block)
+    if regex_match:
+        return HEADING_BLOCK_TYPES[len(regex_match.group(1))]
+
+    if CODE_BLOCK_PATTERN.match(block):
+        return BlockType.CODE
+
+    # the first line decides the only block type the other lines can match
+    if block.startswith(">"):
+        block_type = BlockType.QUOTE
+    elif UNORDERED_LIST_ITEM_PATTERN.match(block):
+        block_type = BlockType.UNORDERED_LIST
+    elif ORDERED_LIST_ITEM_PATTERN.match(block):
+        block_type = BlockType.ORDERED_LIST
+    else:
+        return BlockType.PARAGRAPH
+
+    line_start = 0
+    line_number = 1
+    while block_line_matches(block, line_start, line_number, block_type):
+        line_end = block.find('\n', line_start)
+        if line_end == -1:
+            return block_type
+        line_start = line_end + 1
+        line_number += 1
+    return BlockType.PARAGRAPH
+
+def block_line_matches(block, line_start, line_number, block_type):
+    if block_type == BlockType.QUOTE:
+        return block.startswith(">", line_start)
+    if block_type == BlockType.UNORDERED_LIST:
+        return UNORDERED_LIST_ITEM_PATTERN.match(block, line_start) is not None
+    regex_match = ORDERED_LIST_ITEM_PATTERN.match(block, line_start)
+    return regex_match is not None and int(regex_match.group(1)) == line_number
+
+def block_to_block_type_reference(block):
     # check for header markup
     regex_match = re.match(r"^(#{1,6}) ", block)
     if regex_match:
@@ -113,3 +235,244 @@ def block_to_block_type(block):
     
     # normal paragraph
     return BlockType.PARAGRAPH
+
+# optional caches in front of inline parsing and block parsing, keyed by
+# text and by block text; see enable_parse_caches. Blocks are cached parsed
+# rather than rendered, since builds render from parsed documents, see
+# astcache.py
+inline_cache = None
+block_cache = None
+
+def enable_parse_caches(maxsize):
+    global inline_cache, block_cache
+    if maxsize > 0:
+        inline_cache = LRUCache(maxsize)
+        block_cache = LRUCache(maxsize)
+    else:
+        inline_cache = None
+        block_cache = None
+
+def parse_cache_maxsize():
+    return 0 if inline_cache is None else inline_cache.maxsize
+
+def text_to_textnodes_cached(text):
+    # cached results are shared, so they are tuples of frozen nodes
+    if inline_cache is None:
+        return tuple(map(freeze_text_node, text_to_textnodes(text)))
+    return inline_cache.get_or_compute(text, lambda: tuple(map(freeze_text_node, text_to_textnodes(text))))
+
+def markdown_to_html_node(markdown):
+    return ParentNode("div", list(map(block_to_html_node, markdown_to_indented_blocks(markdown))))
+
+def block_to_html_node(block):
+    return parsed_block_to_html_node(*parse_indented_block(block))
+
+# part of the key of every cached parsed document; bump it whenever
+# parse_document returns something different for the same markdown
+PARSER_VERSION = 3
+# recorded with every page's inputs; bump it whenever the html rendered
+# from the same parsed document changes
+RENDERER_VERSION = 1
+
+LIST_BLOCK_TYPES = (BlockType.UNORDERED_LIST, BlockType.ORDERED_LIST)
+
+def parse_document(markdown):
+    # [(block type, payload)]: the parsed form of a document, see parse_block
+    return list(map(parse_indented_block, markdown_to_indented_blocks(markdown)))
+
+def document_to_html_node(document):
+    return ParentNode("div", blocks_to_html_nodes(document))
+
+def parse_indented_block(block):
+    # cached results are shared between documents, which are never mutated
+    if block_cache is None:
+        return parse_indented_block_uncached(block)
+    return block_cache.get_or_compute(block, lambda: parse_indented_block_uncached(block))
+
+def parse_indented_block_uncached(block):
+    # (block type, payload) of a block from markdown_to_indented_blocks;
+    # indentation places lists and is kept between the fences of code,
+    # everything else is parsed from the stripped block
+    if is_indented(block):
+        lines = block.split('\n')
+        if LIST_ITEM_PATTERN.match(lines[0].lstrip()):
+            nested = parse_nested_list(lines)
+            if nested is not None:
+                return nested
+        code = None
+        if len(lines) > 1 and lines[0].lstrip().startswith("```"):
+            code = '\n'.join([lines[0].lstrip(), *lines[1:-1], lines[-1].strip()])
+        if code is not None and CODE_BLOCK_PATTERN.match(code):
+            block = code
+        else:
+            # the block as markdown_to_blocks returns it
+            block = '\n'.join(map(str.strip, lines))
+    block_type = block_to_block_type(block)
+    return block_type, parse_block(block, block_type)
+
+def parse_nested_list(lines):
+    # one pass with a stack of the open lists, innermost last. A line
+    # indented to the text of the item above it opens a list inside that
+    # item; any other line is an item of the innermost open list indented no
+    # deeper than it. Every line has to be an item, and every ordered list
+    # has to count up from 1, as in flat lists; None if they don't
+    root = None
+    stack = []
+    for line in lines:
+        text = line.lstrip()
+        indent = len(line[:len(line) - len(text)].expandtabs(4))
+        match = LIST_ITEM_PATTERN.match(text)
+        if match is None:
+            return None
+        block_type = BlockType.UNORDERED_LIST if match.group(1) is None else BlockType.ORDERED_LIST
+        while len(stack) > 1 and indent < stack[-1][0]:
+            stack.pop()
+        if stack and indent >= stack[-1][1]:
+            children = stack[-1][3][-1][1]
+            stack.append([indent, None, block_type, []])
+            children.append((block_type, stack[-1][3]))
+        elif not stack:
+            stack.append([indent, None, block_type, []])
+            root = (block_type, stack[-1][3])
+        elif block_type != stack[-1][2]:
+            return None
+        items = stack[-1][3]
+        if block_type == BlockType.ORDERED_LIST and int(match.group(1)) != len(items) + 1:
+            return None
+        # the column this item's text starts at, which nested items reach
+        stack[-1][1] = indent + match.end()
+        items.append((block_text_nodes(text[match.end():]), []))
+    return root
+
+def parse_quote(block):
+    # one pass with a stack of the open quotes, outermost first: a line's
+    # depth is the number of ">" markers it starts with, so deeper lines open
+    # quotes and shallower ones close them. The text of consecutive lines at
+    # one depth forms a block, ended early by an empty line, and is parsed
+    # like a block at the top of the document
+    if NESTED_QUOTE_PATTERN.search(block) is None:
+        # a single level, the usual case, is unquoted in one substitution
+        text = QUOTE_MARKER_PATTERN.sub("", block).strip('\n')
+        return list(map(parse_indented_block, BLANK_LINES_PATTERN.split(text))) if text else []
+    lines = block.split('\n')
+    root = []
+    stack = [root]
+    pending = []
+    for line in lines:
+        match = QUOTE_MARKERS_PATTERN.match(line)
+        depth = match.group().count(">")
+        text = line[match.end():]
+        if pending and (depth != len(stack) or not text):
+            stack[-1].append(parse_indented_block('\n'.join(pending)))
+            pending = []
+        del stack[depth:]
+        while depth > len(stack):
+            quote = []
+            stack[-1].append((BlockType.QUOTE, quote))
+            stack.append(quote)
+        if text:
+            pending.append(text)
+    if pending:
+        stack[-1].append(parse_indented_block('\n'.join(pending)))
+    return root
+
+def parse_block(block, block_type):
+    # the text nodes of a heading or paragraph, the blocks inside a quote,
+    # (text nodes, blocks) per item for lists, whose blocks are the lists
+    # nested in the item, and (language, code) for code blocks
+    match block_type:
+        case BlockType.H1 | BlockType.H2 | BlockType.H3 | BlockType.H4 | BlockType.H5 | BlockType.H6:
+            level = HEADING_BLOCK_TYPES.index(block_type)
+            return block_text_nodes(block[level + 1:])
+        case BlockType.CODE:
+            code = block.rstrip()[3:-3]
+            language = ""
+            if '\n' in code:
+                # the info string after the opening fence starts with the language tag
+                info, code = code.split('\n', 1)
+                language = info.split(" ", 1)[0].strip()
+            return (language, code)
+        case BlockType.QUOTE:
+            return parse_quote(block)
+        case BlockType.UNORDERED_LIST:
+            return [(block_text_nodes(line[2:]), []) for line in block.split('\n')]
+        case BlockType.ORDERED_LIST:
+            return [(block_text_nodes(line[ORDERED_LIST_ITEM_PATTERN.match(line).end():]), []) for line in block.split('\n')]
+        case _:
+            return block_text_nodes(block.replace('\n', ' '))
+
+def parsed_block_to_html_node(block_type, payload):
+    if block_type == BlockType.QUOTE or block_type in LIST_BLOCK_TYPES:
+        return blocks_to_html_nodes([(block_type, payload)])[0]
+    return leaf_block_to_html_node(block_type, payload)
+
+def blocks_to_html_nodes(blocks):
+    # quotes and lists are created with their children lists empty and filled
+    # from an explicit stack, so deep nesting can't hit the recursion limit
+    html_nodes = []
+    pending = [(blocks, html_nodes)]
+    while pending:
+        blocks, children = pending.pop()
+        for block_type, payload in blocks:
+            if block_type == BlockType.QUOTE:
+                if len(payload) == 1 and payload[0][0] == BlockType.PARAGRAPH:
+                    # a quote of one paragraph holds its text directly
+                    children.append(ParentNode("blockquote", text_nodes_to_children(payload[0][1])))
+                    continue
+                quote_children = []
+                children.append(ParentNode("blockquote", quote_children))
+                pending.append((payload, quote_children))
+            elif block_type in LIST_BLOCK_TYPES:
+                items = []
+                for nodes, nested in payload:
+                    item_children = text_nodes_to_children(nodes)
+                    items.append(ParentNode("li", item_children))
+                    if nested:
+                        pending.append((nested, item_children))
+                children.append(ParentNode(block_type.value, items))
+            else:
+                children.append(leaf_block_to_html_node(block_type, payload))
+    return html_nodes
+
+def leaf_block_to_html_node(block_type, payload):
+    match block_type:
+        case BlockType.H1 | BlockType.H2 | BlockType.H3 | BlockType.H4 | BlockType.H5 | BlockType.H6:
+            return ParentNode(block_type.value, text_nodes_to_children(payload))
+        case BlockType.CODE:
+            language, code = payload
+            highlighted = highlight_code(language, code) if language else None
+            if highlighted is None:
+                return ParentNode("pre", [LeafNode("code", code)])
+            return ParentNode("pre", [RawNode(f"<code class=\"language-{escape_attribute(language)}\">{highlighted}</code>")])
+        case _:
+            return ParentNode("p", text_nodes_to_children(payload))
+
+def document_text_nodes(document):
+    # every text node of a parsed document outside code blocks, in document
+    # order; a stack of (iterator, whether it yields list items) stands in
+    # for recursion, as in encode_document
+    stack = [(iter(document), False)]
+    while stack:
+        iterator, is_items = stack[-1]
+        entry = next(iterator, None)
+        if entry is None:
+            stack.pop()
+        elif is_items:
+            yield from entry[0]
+            stack.append((iter(entry[1]), False))
+        else:
+            block_type, payload = entry
+            if block_type == BlockType.QUOTE:
+                stack.append((iter(payload), False))
+            elif block_type in LIST_BLOCK_TYPES:
+                stack.append((iter(payload), True))
+            elif block_type != BlockType.CODE:
+                yield from payload
+
+def block_text_nodes(text):
+    if inline_cache is None:
+        return text_to_textnodes(text)
+    return text_to_textnodes_cached(text)
+
+def text_nodes_to_children(nodes):
+    return list(map(text_node_to_html_node, nodes))
@@ -0,0 +1,144 @@
+import builtins
+import functools
+import keyword
+import os
+import re
+from htmlnode import escape_text
+from manifest import hash_bytes
+from output import write_if_changed
+
+# part of every cache key and of every page's inputs, see depgraph.py; bump
+# it whenever the lexers' output changes
+HIGHLIGHTER_VERSION = 1
+
+def words(names):
+    # longest first so a keyword never stops at a shorter one it starts with
+    return r"\b(?:" + '|'.join(map(re.escape, sorted(names, key=len, reverse=True))) + r")\b"
+
+DOUBLE_QUOTED = r'"(?:[^"\\\n]|\\.)*"'
+SINGLE_QUOTED = r"'(?:[^'\\\n]|\\.)*'"
+NUMBER = r"\b(?:0[xXoObB][\da-fA-F_]+|\d[\d_]*(?:\.\d[\d_]*)?(?:[eE][+-]?\d+)?)\b"
+
+PYTHON = (
+    ("comment", r"#[^\n]*"),
+    ("string", r"(?<!\w)[rRbBuUfF]{0,2}(?:(?s:'''.*?'''|\"\"\".*?\"\"\")|" + DOUBLE_QUOTED + "|" + SINGLE_QUOTED + ")"),
+    ("decorator", r"@[\w.]+"),
+    ("keyword", words(keyword.kwlist + keyword.softkwlist)),
+    ("builtin", words([name for name in dir(builtins) if not name.startswith("_")])),
+    ("number", NUMBER),
+)
+
+JAVASCRIPT = (
+    ("comment", r"//[^\n]*|(?s:/\*.*?\*/)"),
+    ("string", DOUBLE_QUOTED + "|" + SINGLE_QUOTED + r"|(?s:`(?:[^`\\]|\\.)*`)"),
+    ("keyword", words([
+        "async", "await", "break", "case", "catch", "class", "const", "continue", "default", "delete",
+        "do", "else", "export", "extends", "false", "finally", "for", "function", "if", "import", "in",
+        "instanceof", "let", "new", "null", "of", "return", "static", "super", "switch", "this", "throw",
+        "true", "try", "typeof", "undefined", "var", "void", "while", "yield",
+    ])),
+    ("number", NUMBER),
+)
+
+JSON = (
+    ("string", DOUBLE_QUOTED),
+    ("keyword", words(["true", "false", "null"])),
+    ("number", r"-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b"),
+)
+
+SHELL = (
+    ("comment", r"(?<!\S)#[^\n]*"),
+    ("string", DOUBLE_QUOTED + "|" + r"'[^']*'"),
+    ("variable", r"\$(?:\{[^}\n]*\}|\w+|[@*#?$!])"),
+    ("keyword", words([
+        "case", "do", "done", "elif", "else", "esac", "export", "fi", "for", "function", "if", "in",
+        "local", "return", "then", "until", "while",
+    ])),
+)
+
+CSS = (
+    ("comment", r"(?s:/\*.*?\*/)"),
+    ("string", DOUBLE_QUOTED + "|" + SINGLE_QUOTED),
+    ("keyword", r"@[\w-]+|!important\b"),
+    ("number", r"#[\da-fA-F]{3,8}\b|(?<![\w-])-?(?:\d+\.?\d*|\.\d+)(?:%|[a-zA-Z]+)?"),
+)
+
+# language tag after the opening fence -> lexer rules, (token class,
+# pattern) pairs that compiled_lexer compiles on first use, so importing the
+# highlighter costs nothing for builds without fenced code
+LEXERS = {
+    "python": PYTHON,
+    "py": PYTHON,
+    "javascript": JAVASCRIPT,
+    "js": JAVASCRIPT,
+    "json": JSON,
+    "bash": SHELL,
+    "sh": SHELL,
+    "shell": SHELL,
+    "css": CSS,
+}
+
+@functools.cache
+def compiled_lexer(rules):
+    # one alternation of named groups; the group that matched is the token class
+    return re.compile('|'.join(f"(?P<{name}>{pattern})" for name, pattern in rules))
+
+def highlight(language, code):
+    # escaped html with a span per token, or None for unknown languages
+    rules = LEXERS.get(language.lower())
+    if rules is None:
+        return None
+    lexer = compiled_lexer(rules)
+    parts = []
+    position = 0
+    for match in lexer.finditer(code):
+        if match.start() > position:
+            parts.append(escape_text(code[position:match.start()]))
+        parts.append(f"<span class=\"hl-{match.lastgroup}\">{escape_text(match.group())}</span>")
+        position = match.end()
+    parts.append(escape_text(code[position:]))
+    return ''.join(parts)
+
+class HighlightCache:
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, language, code):
+        digest = hash_bytes(f"{HIGHLIGHTER_VERSION}\0{language}\0{code}".encode())
+        return os.path.join(self.directory, digest[:2], digest + ".html")
+
+    def get_or_highlight(self, language, code):
+        path = self.path_for(language, code)
+        try:
+            with open(path, "rb") as f:
+                html = f.read().decode()
+        except FileNotFoundError:
+            html = highlight(language, code)
+            # written atomically, so worker processes racing on the same
+            # sample each leave a complete file
+            write_if_changed(path, html.encode())
+            self.misses += 1
+            return html
+        self.hits += 1
+        return html
+
+    def __repr__(self):
+        return f"HighlightCache({self.directory}, hits={self.hits}, misses={self.misses})"
+
+highlight_cache = None
+
+def enable_highlight_cache(directory):
+    global highlight_cache
+    highlight_cache = HighlightCache(directory) if directory is not None else None
+
+def highlight_cache_dir():
+    return highlight_cache.directory if highlight_cache is not None else None
+
+def highlight_code(language, code):
+    if language.lower() not in LEXERS:
+        return None
+    if highlight_cache is None:
+        return highlight(language, code)
+    return highlight_cache.get_or_highlight(language.lower(), code)
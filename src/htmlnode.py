@@ -1,6 +1,43 @@
+import sys
+
+def escape_text(text):
+    # the membership tests are single C scans, so text with nothing to escape
+    # (nearly all of it) is returned as is without building a new string
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+def escape_attribute(value):
+    if "&" in value or "<" in value or ">" in value or '"' in value:
+        return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+    return value
+
+def render_props(props):
+    return ' '.join([f"{name}=\"{escape_attribute(str(value))}\"" for name, value in props.items()])
+
+class FrozenProps(dict):
+    # props that can't change once built, so their escaped attribute html is
+    # rendered once and shared by every node using them
+    __slots__ = ("html",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.html = render_props(self)
+
+    def __reduce__(self):
+        return (FrozenProps, (dict(self),))
+
+    def frozen(self, *args, **kwargs):
+        raise TypeError("frozen props cannot be modified")
+
+    __setitem__ = __delitem__ = __ior__ = frozen
+    clear = pop = popitem = setdefault = update = frozen
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag = None, value = None, children = None, props = None):
-        self.tag = tag
+        self.tag = sys.intern(tag) if type(tag) is str else tag
         self.value = value
         self.children = children
         self.props = props
@@ -12,4 +49,6 @@ class HTMLNode:
         raise NotImplementedError()
     
     def props_to_html(self):
-        return ' '.join(list(map(lambda kvp: f"{kvp[0]}=\"{kvp[1]}\"", self.props.items())))
+        if type(self.props) is FrozenProps:
+            return self.props.html
+        return render_props(self.props)
@@ -0,0 +1,295 @@
+import io
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from depgraph import static_outputs
+from linkindex import output_page, page_references, resolve_url
+from manifest import hash_bytes
+from output import write_if_changed
+from pages import dest_path_for, find_markdown_files
+from textnode import set_image_variants
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# recorded against images the available resizer couldn't handle, so they
+# aren't tried again until the image or the resizer changes
+RESIZER = "pillow" if Image is not None else "png"
+
+# widths of the derivatives generated for images wider than them
+IMAGE_WIDTHS = (480, 960, 1440)
+IMAGE_FORMATS = {".png": "png", ".gif": "gif", ".jpg": "jpeg", ".jpeg": "jpeg"}
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# png color type -> bytes per pixel at bit depth 8
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+class ImageStats:
+    def __init__(self):
+        self.images = 0
+        self.generated = 0
+        self.reused = 0
+        self.unsupported = 0
+
+    def __repr__(self):
+        return (
+            f"{self.images} images, generated {self.generated} derivatives, "
+            f"reused {self.reused}, {self.unsupported} could not be resized"
+        )
+
+def image_size(data):
+    # (width, height) from the file header, or None for unknown formats and
+    # headers cut short
+    if data.startswith(PNG_SIGNATURE):
+        if len(data) < 24 or data[12:16] != b"IHDR":
+            return None
+        return struct.unpack(">II", data[16:24])
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        if len(data) < 10:
+            return None
+        return struct.unpack("<HH", data[6:10])
+    if data.startswith(b"\xff\xd8"):
+        position = 2
+        while position + 9 <= len(data) and data[position] == 0xFF:
+            marker = data[position + 1]
+            length = struct.unpack(">H", data[position + 2:position + 4])[0]
+            # start of frame markers, skipping DHT, JPG and DAC
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">HH", data[position + 5:position + 9])
+                return width, height
+            position += 2 + length
+    return None
+
+class PngImage:
+    def __init__(self, width, height, color_type, rows, chunks):
+        self.width = width
+        self.height = height
+        self.color_type = color_type
+        # unfiltered scanlines, one bytearray per row
+        self.rows = rows
+        # PLTE and tRNS chunks, copied to derivatives unchanged
+        self.chunks = chunks
+
+def read_png(data):
+    # non-interlaced 8-bit pngs only; returns None for anything else,
+    # including files that are truncated or corrupt
+    position = len(PNG_SIGNATURE)
+    header = None
+    idat = []
+    chunks = []
+    while position + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[position:position + 8])
+        body = data[position + 8:position + 8 + length]
+        position += 12 + length
+        if kind == b"IHDR" and len(body) == 13:
+            header = struct.unpack(">IIBBBBB", body)
+        elif kind == b"IDAT":
+            idat.append(body)
+        elif kind in (b"PLTE", b"tRNS"):
+            chunks.append((kind, body))
+        elif kind == b"IEND":
+            break
+    if header is None:
+        return None
+    width, height, depth, color_type, _, _, interlace = header
+    if depth != 8 or interlace != 0 or color_type not in PNG_CHANNELS:
+        return None
+    channels = PNG_CHANNELS[color_type]
+    stride = width * channels
+    try:
+        raw = zlib.decompress(b"".join(idat))
+    except zlib.error:
+        return None
+    if len(raw) < height * (stride + 1):
+        return None
+    rows = []
+    previous = bytearray(stride)
+    for y in range(height):
+        start = y * (stride + 1)
+        if raw[start] > 4:
+            return None
+        row = bytearray(raw[start + 1:start + 1 + stride])
+        unfilter_row(raw[start], row, previous, channels)
+        rows.append(row)
+        previous = row
+    return PngImage(width, height, color_type, rows, chunks)
+
+def unfilter_row(filter_type, row, previous, channels):
+    if filter_type == 0:
+        return
+    if filter_type == 1:
+        for i in range(channels, len(row)):
+            row[i] = (row[i] + row[i - channels]) & 0xFF
+    elif filter_type == 2:
+        for i in range(len(row)):
+            row[i] = (row[i] + previous[i]) & 0xFF
+    elif filter_type == 3:
+        for i in range(len(row)):
+            left = row[i - channels] if i >= channels else 0
+            row[i] = (row[i] + ((left + previous[i]) >> 1)) & 0xFF
+    elif filter_type == 4:
+        for i in range(len(row)):
+            left = row[i - channels] if i >= channels else 0
+            upper_left = previous[i - channels] if i >= channels else 0
+            up = previous[i]
+            estimate = left + up - upper_left
+            left_distance = abs(estimate - left)
+            up_distance = abs(estimate - up)
+            upper_left_distance = abs(estimate - upper_left)
+            if left_distance <= up_distance and left_distance <= upper_left_distance:
+                predictor = left
+            elif up_distance <= upper_left_distance:
+                predictor = up
+            else:
+                predictor = upper_left
+            row[i] = (row[i] + predictor) & 0xFF
+    else:
+        raise Exception(f"invalid png filter type: {filter_type}")
+
+def resize_png(image, width, height):
+    # nearest neighbour, which keeps palette indices valid; one precomputed
+    # list of source byte offsets is reused for every output row
+    channels = PNG_CHANNELS[image.color_type]
+    offsets = [x * image.width // width * channels + channel for x in range(width) for channel in range(channels)]
+    rows = [bytes(map(image.rows[y * image.height // height].__getitem__, offsets)) for y in range(height)]
+    return PngImage(width, height, image.color_type, rows, image.chunks)
+
+def write_png(image):
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+    header = struct.pack(">IIBBBBB", image.width, image.height, 8, image.color_type, 0, 0, 0)
+    raw = b"".join(b"\x00" + row for row in image.rows)
+    return b"".join([
+        PNG_SIGNATURE,
+        chunk(b"IHDR", header),
+        *(chunk(kind, body) for kind, body in image.chunks),
+        chunk(b"IDAT", zlib.compress(raw, 6)),
+        chunk(b"IEND", b""),
+    ])
+
+def resize_image(data, image_format, width, height):
+    # resized file bytes, or None when no available resizer handles the image
+    if Image is not None:
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                resized = image.resize((width, height), Image.LANCZOS)
+                output = io.BytesIO()
+                resized.save(output, image_format)
+                return output.getvalue()
+        except OSError:
+            # unidentified, truncated or corrupt images
+            return None
+    if image_format != "png":
+        return None
+    image = read_png(data)
+    if image is None:
+        return None
+    return write_png(resize_png(image, width, height))
+
+def make_derivative(source, cache_path, image_format, width, height):
+    with open(source, "rb") as f:
+        resized = resize_image(f.read(), image_format, width, height)
+    if resized is None:
+        return False
+    write_if_changed(cache_path, resized)
+    return True
+
+def derivative_name(path, width):
+    root, extension = os.path.splitext(path)
+    return f"{root}.{width}w{extension}"
+
+def cached_image_size(path, manifest):
+    # [digest, width, height, resizer that failed on it or None], read again
+    # only when the image changed
+    digest = manifest.digest(path)
+    cached = manifest.images.get(path)
+    if cached is None or cached[0] != digest:
+        with open(path, "rb") as f:
+            size = image_size(f.read())
+        cached = [digest, *(size or (None, None)), None]
+        manifest.images[path] = cached
+    return cached
+
+def referenced_images(content_dir, dest_dir, manifest):
+    # site-absolute image urls from every page -> (output path, static source);
+    # the urls are what text_node_to_html_node sees, so they key the variants
+    static_sources = static_outputs(dest_dir, manifest)
+    images = {}
+    for source in find_markdown_files(content_dir):
+        page = output_page(dest_path_for(source, content_dir, dest_dir), dest_dir)
+        for url in page_references(source, manifest)[2]:
+            if not url.startswith("/") or url.startswith("//") or "?" in url or "#" in url:
+                continue
+            target = resolve_url(page, url)
+            if target in static_sources:
+                images[url] = (target, static_sources[target])
+    return images
+
+def process_images(content_dir, dest_dir, manifest, cache_dir, jobs = 1):
+    # derivatives live in cache_dir under a hash of (source digest, width,
+    # format), so an image is only ever resized once per size; static files
+    # must be synced first since images are found through manifest.static
+    stats = ImageStats()
+    images = referenced_images(content_dir, dest_dir, manifest)
+    variants = {}
+    derivatives = []
+    pending = []
+    for url, (target, path) in sorted(images.items()):
+        digest, width, height, failed_resizer = cached_image_size(path, manifest)
+        stats.images += 1
+        if width is None:
+            continue
+        if failed_resizer == RESIZER:
+            stats.unsupported += 1
+            derivatives.append((url, target, width, height, []))
+            continue
+        extension = os.path.splitext(path)[1].lower()
+        image_format = IMAGE_FORMATS.get(extension)
+        sizes = []
+        for derivative_width in IMAGE_WIDTHS if image_format is not None else ():
+            if derivative_width >= width:
+                break
+            derivative_height = max(1, round(height * derivative_width / width))
+            key = hash_bytes(f"{digest}\0{derivative_width}\0{image_format}".encode())
+            cache_path = os.path.join(cache_dir, key[:2], key + extension)
+            if os.path.exists(cache_path):
+                stats.reused += 1
+            else:
+                pending.append((path, cache_path, image_format, derivative_width, derivative_height))
+            sizes.append((derivative_width, cache_path))
+        derivatives.append((url, target, width, height, sizes))
+    if jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(jobs) as executor:
+            made = list(executor.map(make_derivative, *zip(*pending)))
+    else:
+        made = [make_derivative(*task) for task in pending]
+    stats.generated += sum(made)
+    unsupported = {task[0] for task, success in zip(pending, made) if not success}
+    stats.unsupported += len(unsupported)
+    for path in unsupported:
+        manifest.images[path][3] = RESIZER
+    derived = {}
+    for url, target, width, height, sizes in derivatives:
+        srcset = []
+        for derivative_width, cache_path in sizes:
+            if not os.path.exists(cache_path):
+                continue
+            dest = os.path.join(dest_dir, derivative_name(target, derivative_width))
+            if manifest.derived.get(dest) != cache_path or not os.path.exists(dest):
+                with open(cache_path, "rb") as f:
+                    write_if_changed(dest, f.read())
+            derived[dest] = cache_path
+            srcset.append(f"{derivative_name(url, derivative_width)} {derivative_width}w")
+        variants[url] = {"width": str(width), "height": str(height)}
+        if srcset:
+            variants[url]["srcset"] = ', '.join(srcset + [f"{url} {width}w"])
+    for dest in set(manifest.derived) - set(derived):
+        if os.path.exists(dest):
+            os.remove(dest)
+    manifest.derived = derived
+    for path in set(manifest.images) - {path for _, path in images.values()}:
+        del manifest.images[path]
+    set_image_variants(variants)
+    return stats
@@ -0,0 +1,98 @@
+import threading
+import time
+import astcache
+import functions
+import highlight
+import pages
+import static
+from parentnode import ParentNode
+
+class StageStats:
+    # "file write" runs on the output queue's threads, so totals are updated
+    # under a lock; wall is the sum of every call's duration, which exceeds
+    # the elapsed time when calls overlap, and cpu is each calling thread's own
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.nodes = 0
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def add(self, wall, cpu, nodes, size):
+        with self.lock:
+            self.calls += 1
+            self.wall += wall
+            self.cpu += cpu
+            self.nodes += nodes
+            self.bytes += size
+
+    def to_json(self):
+        return {
+            "calls": self.calls,
+            "wall_seconds": self.wall,
+            "cpu_seconds": self.cpu,
+            "nodes": self.nodes,
+            "bytes": self.bytes,
+        }
+
+# stage name -> (owner, attribute, function of (args, result) -> (nodes, bytes));
+# the functions are wrapped only while instrumentation is on, so a normal
+# build runs the original code with no timing overhead at all
+STAGES = {
+    "block splitting": (functions, "markdown_to_indented_blocks", lambda args, result: (len(result), len(args[0]))),
+    "classification": (functions, "block_to_block_type", lambda args, result: (1, len(args[0]))),
+    "inline parsing": (functions, "text_to_textnodes", lambda args, result: (len(result), len(args[0]))),
+    "highlighting": (highlight, "highlight", lambda args, result: (1, len(args[1]))),
+    "parsed cache load": (astcache, "decode_document", lambda args, result: (len(result), len(args[0]))),
+    "html nodes": (functions, "text_node_to_html_node", lambda args, result: (1, len(args[0].text))),
+    "serialization": (ParentNode, "to_html", lambda args, result: (1, len(result))),
+    "file read": (pages, "read_file", lambda args, result: (1, len(result))),
+    "file write": (pages, "write_page", lambda args, result: (1, len(args[1]))),
+    "static copy": (static, "copy_file", lambda args, result: (1, args[1].st_size)),
+}
+
+stages = {}
+originals = {}
+
+def instrument():
+    for name, (owner, attribute, measure) in STAGES.items():
+        if name in originals:
+            continue
+        original = getattr(owner, attribute)
+        originals[name] = original
+        stats = stages.setdefault(name, StageStats())
+        setattr(owner, attribute, timed(original, stats, measure))
+
+def uninstrument():
+    for name, original in originals.items():
+        owner, attribute, _ = STAGES[name]
+        setattr(owner, attribute, original)
+    originals.clear()
+
+def reset():
+    stages.clear()
+
+def timed(function, stats, measure):
+    def wrapper(*args):
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        result = function(*args)
+        cpu = time.thread_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+        stats.add(wall, cpu, *measure(args, result))
+        return result
+    return wrapper
+
+def report():
+    # the name column fits the longest stage name
+    width = max(map(len, STAGES))
+    lines = [f"{'stage':<{width}} {'calls':>9} {'wall ms':>10} {'cpu ms':>10} {'nodes':>10} {'bytes':>12}"]
+    for name, stats in stages.items():
+        lines.append(
+            f"{name:<{width}} {stats.calls:>9} {stats.wall * 1000:>10.1f} {stats.cpu * 1000:>10.1f} "
+            f"{stats.nodes:>10} {stats.bytes:>12}")
+    return '\n'.join(lines)
+
+def to_json():
+    return {name: stats.to_json() for name, stats in stages.items()}
@@ -1,14 +1,17 @@
-from htmlnode import HTMLNode
+from htmlnode import HTMLNode, escape_text
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props = None):
         super().__init__(tag, value, None, props)
 
     def to_html(self):
         if self.value is None:
             raise ValueError()
+        value = escape_text(self.value)
         if self.tag is None:
-            return self.value
+            return value
         if self.props is None:
-            return f"<{self.tag}>{self.value}</{self.tag}>"
-        return f"<{self.tag} {self.props_to_html()}>{self.value}</{self.tag}>"
+            return f"<{self.tag}>{value}</{self.tag}>"
+        return f"<{self.tag} {self.props_to_html()}>{value}</{self.tag}>"
@@ -0,0 +1,97 @@
+import os
+import posixpath
+from urllib.parse import unquote, urlsplit
+from astcache import parse_document_cached
+from functions import document_text_nodes
+from pages import dest_path_for, find_markdown_files, read_file, split_front_matter
+from textnode import TextType
+
+class LinkIndex:
+    def __init__(self):
+        # page -> [(url, resolved output path or None for external urls)],
+        # pages being output paths relative to the site root
+        self.links = {}
+        self.images = {}
+
+    def add_page(self, page, link_urls, image_urls):
+        self.links[page] = [(url, resolve_url(page, url)) for url in link_urls]
+        self.images[page] = [(url, resolve_url(page, url)) for url in image_urls]
+
+    def reverse_links(self):
+        reverse = {}
+        for page, links in self.links.items():
+            for _, target in links:
+                if target is not None:
+                    reverse.setdefault(target, set()).add(page)
+        return reverse
+
+def resolve_url(page, url):
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc:
+        return None
+    path = unquote(parts.path)
+    if path == "":
+        # a bare fragment or query refers to the page itself
+        return page
+    if path.startswith("/"):
+        resolved = posixpath.normpath(path.lstrip("/") or ".")
+    else:
+        resolved = posixpath.normpath(posixpath.join(posixpath.dirname(page), path))
+    if path.endswith("/") or resolved == ".":
+        resolved = "index.html" if resolved == "." else resolved + "/index.html"
+    return resolved
+
+def extract_page_references(markdown):
+    # urls of the link and image nodes the page renders, so link syntax in
+    # code is never a reference; the parse comes from the document cache
+    _, body = split_front_matter(markdown)
+    link_urls = []
+    image_urls = []
+    for node in document_text_nodes(parse_document_cached(body)):
+        if node.text_type == TextType.LINK:
+            link_urls.append(node.url)
+        elif node.text_type == TextType.IMAGE:
+            image_urls.append(node.url)
+    return link_urls, image_urls
+
+def build_link_index(content_dir, dest_dir, manifest):
+    # references are cached in the manifest by source digest, so only pages
+    # that changed since the last index are read and scanned again
+    index = LinkIndex()
+    sources = find_markdown_files(content_dir)
+    for source in sources:
+        _, link_urls, image_urls = page_references(source, manifest)
+        page = output_page(dest_path_for(source, content_dir, dest_dir), dest_dir)
+        index.add_page(page, link_urls, image_urls)
+    for source in set(manifest.links) - set(sources):
+        del manifest.links[source]
+    return index
+
+def page_references(source, manifest):
+    digest = manifest.digest(source)
+    cached = manifest.links.get(source)
+    if cached is None or cached[0] != digest:
+        cached = [digest, *extract_page_references(read_file(source))]
+        manifest.links[source] = cached
+    return cached
+
+def output_page(path, dest_dir):
+    return os.path.relpath(path, dest_dir).replace(os.sep, "/")
+
+def list_outputs(dest_dir):
+    # one walk of the output tree instead of a stat per link
+    outputs = set()
+    for dir_path, _, file_names in os.walk(dest_dir):
+        for file_name in file_names:
+            outputs.add(output_page(os.path.join(dir_path, file_name), dest_dir))
+    return outputs
+
+def find_broken_references(index, outputs):
+    broken = []
+    for kind, references in (("link", index.links), ("image", index.images)):
+        for page, targets in references.items():
+            for url, resolved in targets:
+                if resolved is None or resolved in outputs or resolved + "/index.html" in outputs:
+                    continue
+                broken.append((page, kind, url))
+    return broken
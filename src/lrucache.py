@@ -0,0 +1,33 @@
+from collections import OrderedDict
+
+class LRUCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"LRUCache(size={len(self.entries)}/{self.maxsize}, hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+
+    def get_or_compute(self, key, compute):
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            self.entries[key] = value
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            return value
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def clear(self):
+        self.entries.clear()
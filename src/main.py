@@ -1,4 +1,144 @@
-from textnode import *
+import argparse
+import sys
 
-text_node = TextNode("foo", TextType.LINK, "https://boot.dev")
-print(text_node)
+# subsystems are imported by the command that needs them, so "check" or a
+# watch hook never pays for loading the whole build; see bench_startup.py
+
+STATIC_DIR = "static"
+CONTENT_DIR = "content"
+TEMPLATE_PATH = "template.html"
+PUBLIC_DIR = "public"
+MANIFEST_PATH = ".cache/manifest.json"
+DOCUMENT_CACHE_DIR = ".cache/parsed"
+HIGHLIGHT_CACHE_DIR = ".cache/highlight"
+IMAGE_CACHE_DIR = ".cache/images"
+
+def build(args):
+    if not (args.profile or args.profile_json or args.cprofile):
+        run_build(args)
+        return
+    import cProfile
+    import instrumentation
+    instrumentation.instrument()
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        run_build(args)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+        instrumentation.uninstrument()
+    if args.profile:
+        print(instrumentation.report())
+    if args.profile_json:
+        import json
+        with open(args.profile_json, "w") as f:
+            json.dump(instrumentation.to_json(), f, indent=2)
+
+def run_build(args):
+    import functions
+    from astcache import enable_document_cache
+    from build import generate_pages
+    from compress import DEFAULT_COMPRESS_LEVEL, compress_outputs
+    from highlight import enable_highlight_cache
+    from images import process_images
+    from linkindex import output_page
+    from manifest import BuildManifest
+    from searchindex import build_search_index
+    from static import sync_static
+    functions.enable_parse_caches(args.parse_cache)
+    enable_document_cache(DOCUMENT_CACHE_DIR)
+    enable_highlight_cache(HIGHLIGHT_CACHE_DIR)
+    manifest = BuildManifest.load(MANIFEST_PATH)
+    print(f"static: {sync_static(STATIC_DIR, PUBLIC_DIR, manifest, args.hash, minify=True)}")
+    print(f"images: {process_images(CONTENT_DIR, PUBLIC_DIR, manifest, IMAGE_CACHE_DIR, args.jobs)}")
+    reasons = {} if args.explain else None
+    generated = generate_pages(CONTENT_DIR, TEMPLATE_PATH, PUBLIC_DIR, manifest, args.jobs, reasons)
+    tokenized = build_search_index(CONTENT_DIR, PUBLIC_DIR, manifest)
+    compress_level = args.compress_level if args.compress_level is not None else DEFAULT_COMPRESS_LEVEL
+    compressed = compress_outputs(PUBLIC_DIR, manifest, compress_level, args.jobs)
+    manifest.save()
+    if reasons is not None:
+        for dest in sorted(reasons):
+            print(f"{output_page(dest, PUBLIC_DIR)}: {', '.join(reasons[dest])}")
+    print(f"generated {len(generated)} pages, indexed {tokenized} for search")
+    print(f"compression: {compressed}")
+    if functions.inline_cache is not None:
+        print(f"inline cache: {functions.inline_cache}")
+        print(f"block cache: {functions.block_cache}")
+
+def check(args):
+    from astcache import enable_document_cache
+    from linkindex import build_link_index, find_broken_references, list_outputs
+    from manifest import BuildManifest
+    enable_document_cache(DOCUMENT_CACHE_DIR)
+    manifest = BuildManifest.load(MANIFEST_PATH)
+    index = build_link_index(CONTENT_DIR, PUBLIC_DIR, manifest)
+    manifest.save()
+    broken = find_broken_references(index, list_outputs(PUBLIC_DIR))
+    for page, kind, url in broken:
+        print(f"{page}: broken {kind} {url}")
+    link_count = sum(map(len, index.links.values()))
+    image_count = sum(map(len, index.images.values()))
+    print(f"checked {link_count} links and {image_count} images in {len(index.links)} pages, {len(broken)} broken")
+    return 1 if broken else 0
+
+def serve(args):
+    import devserver
+    from astcache import enable_document_cache
+    from highlight import enable_highlight_cache
+    from manifest import BuildManifest
+    enable_document_cache(DOCUMENT_CACHE_DIR)
+    enable_highlight_cache(HIGHLIGHT_CACHE_DIR)
+    manifest = BuildManifest.load(MANIFEST_PATH)
+    site = devserver.DevSite(CONTENT_DIR, TEMPLATE_PATH, STATIC_DIR, PUBLIC_DIR, manifest, IMAGE_CACHE_DIR)
+    try:
+        devserver.serve(site, args.port, args.watch)
+    except KeyboardInterrupt:
+        manifest.save()
+
+def bench(argv):
+    import benchmarks
+    return benchmarks.main(argv)
+
+def with_default_command(argv):
+    # build is the default command, also when the arguments start with one of
+    # its options, as in "main.py --jobs 4"
+    if not argv or (argv[0].startswith("-") and argv[0] not in ("-h", "--help")):
+        return ["build", *argv]
+    return argv
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Build the static site into public/")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="build the site once")
+    build_parser.add_argument("--jobs", "-j", type=int, default=1, help="number of worker processes")
+    build_parser.add_argument("--hash", action="store_true", help="compare static files by hash when only their mtime changed")
+    build_parser.add_argument("--parse-cache", type=int, default=0, metavar="SIZE", help="cache up to SIZE parsed inline texts and blocks")
+    build_parser.add_argument("--compress-level", type=int, choices=range(0, 10), metavar="LEVEL", help="gzip level (and brotli quality) of the precompressed outputs, 0 to 9")
+    build_parser.add_argument("--explain", action="store_true", help="print why each page was rebuilt")
+    build_parser.add_argument("--profile", action="store_true", help="print time, node and byte counts per build stage (stages run in worker processes are not counted)")
+    build_parser.add_argument("--profile-json", metavar="PATH", help="write the per-stage profile to PATH as JSON")
+    build_parser.add_argument("--cprofile", metavar="PATH", help="write cProfile stats for the build to PATH")
+    build_parser.set_defaults(handler=build)
+    check_parser = subparsers.add_parser("check", help="report broken internal links and missing images in the built site")
+    check_parser.set_defaults(handler=check)
+    serve_parser = subparsers.add_parser("serve", help="build the site and serve public/ over http")
+    serve_parser.add_argument("--port", type=int, default=8888)
+    serve_parser.add_argument("--watch", action="store_true", help="rebuild changed pages while serving")
+    serve_parser.set_defaults(handler=serve)
+    bench_parser = subparsers.add_parser("bench", help="time the hot paths against the stored baseline; other options go to benchmarks.py", add_help=False)
+    bench_parser.set_defaults(handler=bench)
+    # only bench takes options this parser doesn't know; they are passed on
+    # so benchmarks.py, and its imports, stay out of every other command
+    args, extra = parser.parse_known_args(with_default_command(argv))
+    if args.handler is bench:
+        return bench(extra)
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
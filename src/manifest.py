@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 9
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(path):
+    with open(path, "rb") as f:
+        return hash_bytes(f.read())
+
+class BuildManifest:
+    def __init__(self, path = None):
+        self.path = path
+        # path -> [mtime_ns, size, digest]; lets unchanged files skip hashing
+        self.files = {}
+        # source path -> {"dest": output path, "inputs": {path: digest},
+        # "links": {page: existed}, "assets": {path: existed}}; the dependency
+        # graph, see depgraph.py
+        self.pages = {}
+        # output path -> static source path copied there by the last sync
+        self.static = {}
+        # source path -> [digest, link urls, image urls] for the link index
+        self.links = {}
+        # source path -> [digest, title, {term: count}] for the search index
+        self.search = {}
+        # static image path -> [digest, width, height, resizer that couldn't
+        # make its derivatives or None]
+        self.images = {}
+        # output path of a resized image -> its file in the image cache
+        self.derived = {}
+        # output path -> digest of the bytes its .gz and .br siblings hold
+        self.compressed = {}
+
+    @classmethod
+    def load(cls, path):
+        manifest = cls(path)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return manifest
+        if data.get("version") != MANIFEST_VERSION:
+            return manifest
+        manifest.files = data["files"]
+        manifest.pages = data["pages"]
+        manifest.static = data["static"]
+        manifest.links = data["links"]
+        manifest.search = data["search"]
+        manifest.images = data["images"]
+        manifest.derived = data["derived"]
+        manifest.compressed = data["compressed"]
+        return manifest
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "files": self.files,
+                "pages": self.pages,
+                "static": self.static,
+                "links": self.links,
+                "search": self.search,
+                "images": self.images,
+                "derived": self.derived,
+                "compressed": self.compressed,
+            }, f)
+
+    def digest(self, path):
+        stat = os.stat(path)
+        entry = self.files.get(path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+        digest = hash_file(path)
+        self.files[path] = [stat.st_mtime_ns, stat.st_size, digest]
+        return digest
+
+    def record_page(self, source, dest, inputs, links = None, assets = None):
+        self.pages[source] = {"dest": dest, "inputs": inputs, "links": links or {}, "assets": assets or {}}
+
+    def forget_page(self, source):
+        self.files.pop(source, None)
+        self.links.pop(source, None)
+        self.search.pop(source, None)
+        return self.pages.pop(source)
@@ -0,0 +1,67 @@
+import os
+import threading
+
+def write_if_changed(path, data):
+    # leave files already holding data untouched so their mtime survives, and
+    # write others through a temp file so readers never see half a page
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except FileNotFoundError:
+        pass
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return True
+
+class OutputQueue:
+    # runs writes on a thread pool while the caller keeps rendering; put blocks
+    # once max_pending writes are waiting so queued pages can't pile up in memory
+    def __init__(self, max_workers = 8, max_pending = 64):
+        # concurrent.futures is imported here since most importers of this
+        # module only call write_if_changed
+        from concurrent.futures import ThreadPoolExecutor
+        self.executor = ThreadPoolExecutor(max_workers)
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.lock = threading.Lock()
+        self.errors = []
+
+    def put(self, write, *args):
+        self.slots.acquire()
+        try:
+            future = self.executor.submit(write, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(self.finished)
+
+    def finished(self, future):
+        self.slots.release()
+        error = future.exception()
+        if error is not None:
+            with self.lock:
+                self.errors.append(error)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        if self.errors:
+            raise self.errors[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.executor.shutdown(wait=True)
@@ -0,0 +1,104 @@
+import os
+import re
+from astcache import enable_document_cache, markdown_to_html_node_cached
+from compress import minify_html
+from htmlnode import escape_attribute
+from functions import enable_parse_caches
+from highlight import enable_highlight_cache
+from textnode import set_image_variants
+from output import write_if_changed
+
+FRONT_MATTER_PATTERN = re.compile(r"---\n(.*?)(?<=\n)---[ \t]*(?:\n|\Z)", re.DOTALL)
+
+def extract_title(markdown):
+    for line in markdown.split('\n'):
+        if line.startswith("# "):
+            return line[2:].strip()
+    raise Exception("markdown must have an h1 header")
+
+def split_front_matter(markdown):
+    # optional "key: value" lines between "---" fences at the top of a page
+    match = FRONT_MATTER_PATTERN.match(markdown)
+    if match is None:
+        return {}, markdown
+    variables = {}
+    for line in match.group(1).split('\n'):
+        if line.strip() == "":
+            continue
+        key, separator, value = line.partition(":")
+        if separator == "":
+            raise Exception(f"invalid front matter line: '{line}'")
+        variables[key.strip()] = value.strip()
+    return variables, markdown[match.end():]
+
+def page_variables(markdown):
+    variables, body = split_front_matter(markdown)
+    if "Title" not in variables:
+        variables["Title"] = extract_title(body)
+    return variables, body
+
+def page_document(markdown):
+    # (page variables, ParentNode of the body), everything a page is
+    # rendered from besides the template
+    variables, body = page_variables(markdown)
+    return variables, markdown_to_html_node_cached(body)
+
+def render_document(document, template):
+    # the title and front matter values are text, escaped for element content
+    # and quoted attributes alike; Content is the body's html
+    variables, node = document
+    variables = {name: escape_attribute(value) for name, value in variables.items()}
+    variables["Content"] = node.to_html()
+    return render_template(template, variables)
+
+def render_page(markdown, template):
+    return render_document(page_document(markdown), template)
+
+def render_template(template, variables):
+    # pages are minified before they are written, so a change that only
+    # moves whitespace leaves the output, and its mtime, as it was
+    return minify_html(template.render(variables))
+
+def read_file(path):
+    with open(path) as f:
+        return f.read()
+
+def write_page(dest_path, html):
+    return write_if_changed(dest_path, html.encode())
+
+def find_markdown_files(content_dir):
+    sources = []
+    for dir_path, dir_names, file_names in os.walk(content_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            if file_name.endswith(".md"):
+                sources.append(os.path.join(dir_path, file_name))
+    return sources
+
+def dest_path_for(source, content_dir, dest_dir):
+    relative_path = os.path.relpath(source, content_dir)
+    return os.path.join(dest_dir, os.path.splitext(relative_path)[0] + ".html")
+
+worker_template = None
+
+def init_worker(template, parse_cache_size, document_cache_dir, highlight_cache_dir, image_variants):
+    enable_parse_caches(parse_cache_size)
+    enable_document_cache(document_cache_dir)
+    enable_highlight_cache(highlight_cache_dir)
+    set_image_variants(image_variants)
+    set_worker_template(template)
+
+def set_worker_template(template):
+    global worker_template
+    worker_template = template
+
+def generate_page_from_worker(source, dest):
+    write_page(dest, render_page(read_file(source), worker_template))
+
+def queue_page_from_worker(output, source, dest, documents = None):
+    # render here and leave the write to the output queue's threads;
+    # documents, when given, maps source to the page_document rendered
+    document = page_document(read_file(source))
+    if documents is not None:
+        documents[source] = document
+    output.put(write_page, dest, render_document(document, worker_template))
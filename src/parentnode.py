@@ -1,14 +1,34 @@
-from functools import reduce
 from htmlnode import HTMLNode
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children):
         super().__init__(tag, None, children)
 
     def to_html(self):
-        if self.tag is None:
-            raise ValueError("parent node must have a tag")
-        if self.children is None:
-            raise ValueError("parent node must have a child")
-        inner_text = ''.join(list(reduce(lambda acc, node: acc + node.to_html(), self.children, "")))
-        return f"<{self.tag}>{inner_text}</{self.tag}>"
+        return ''.join(self.iter_html())
+
+    def write_html(self, stream):
+        for chunk in self.iter_html():
+            stream.write(chunk)
+
+    def iter_html(self):
+        # walk the tree with an explicit stack of nodes and pending closing
+        # tags so deep trees don't hit the recursion limit
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                yield item
+                continue
+            if not isinstance(item, ParentNode):
+                yield item.to_html()
+                continue
+            if item.tag is None:
+                raise ValueError("parent node must have a tag")
+            if item.children is None:
+                raise ValueError("parent node must have a child")
+            yield f"<{item.tag}>"
+            stack.append(f"</{item.tag}>")
+            stack.extend(reversed(item.children))
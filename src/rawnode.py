@@ -0,0 +1,10 @@
+from htmlnode import HTMLNode
+
+class RawNode(HTMLNode):
+    __slots__ = ()
+
+    def __init__(self, html):
+        super().__init__(None, html)
+
+    def to_html(self):
+        return self.value
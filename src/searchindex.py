@@ -0,0 +1,93 @@
+import json
+import os
+import re
+from collections import Counter
+from astcache import parse_document_cached
+from functions import document_text_nodes
+from linkindex import output_page
+from output import write_if_changed
+from pages import dest_path_for, find_markdown_files, page_variables, read_file
+
+SEARCH_INDEX_VERSION = 1
+SEARCH_DIR = "search"
+TOKEN_PATTERN = re.compile(r"\w+")
+# file name of the section holding pages at the top of the site
+ROOT_SECTION = "_root"
+
+def page_terms(markdown):
+    # term counts over the text nodes of every block but code, so markup
+    # never ends up in the index; the page was parsed for rendering in the
+    # same build, so the parse comes from the document cache
+    variables, body = page_variables(markdown)
+    counts = Counter()
+    for node in document_text_nodes(parse_document_cached(body)):
+        counts.update(TOKEN_PATTERN.findall(node.text.lower()))
+    return variables["Title"], dict(counts)
+
+def page_section(page):
+    section, separator, _ = page.partition("/")
+    return section if separator else ROOT_SECTION
+
+def encode_section(pages):
+    # pages is [(url, title, terms)]; posting lists hold the gaps between
+    # ascending page ids, each followed by the term's count on that page
+    pages = sorted(pages)
+    postings = {}
+    for page_id, (_, _, terms) in enumerate(pages):
+        for term, count in terms.items():
+            posting = postings.get(term)
+            if posting is None:
+                postings[term] = [page_id, count, page_id]
+            else:
+                posting[-1:] = [page_id - posting[-1], count, page_id]
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "pages": [[url, title] for url, title, _ in pages],
+        "terms": {term: posting[:-1] for term, posting in sorted(postings.items())},
+    }
+
+def decode_postings(posting):
+    page_id = 0
+    decoded = []
+    for index in range(0, len(posting), 2):
+        page_id += posting[index]
+        decoded.append((page_id, posting[index + 1]))
+    return decoded
+
+def build_search_index(content_dir, dest_dir, manifest):
+    # terms are cached in the manifest by source digest, so only pages that
+    # changed since the last build are tokenized again; returns the number
+    # of pages tokenized
+    sections = {}
+    tokenized = 0
+    sources = find_markdown_files(content_dir)
+    for source in sources:
+        digest = manifest.digest(source)
+        cached = manifest.search.get(source)
+        if cached is None or cached[0] != digest:
+            cached = [digest, *page_terms(read_file(source))]
+            manifest.search[source] = cached
+            tokenized += 1
+        page = output_page(dest_path_for(source, content_dir, dest_dir), dest_dir)
+        sections.setdefault(page_section(page), []).append(("/" + page, cached[1], cached[2]))
+    for source in set(manifest.search) - set(sources):
+        del manifest.search[source]
+    write_search_index(sections, os.path.join(dest_dir, SEARCH_DIR))
+    return tokenized
+
+def write_search_index(sections, search_dir):
+    # a small top level file lists the section shards, so a client fetches
+    # only the sections it searches; unchanged shards are not rewritten
+    section_dir = os.path.join(search_dir, "sections")
+    shards = {}
+    for section, pages in sorted(sections.items()):
+        shards[section] = {"file": f"sections/{section}.json", "pages": len(pages)}
+        write_if_changed(os.path.join(section_dir, section + ".json"), json_bytes(encode_section(pages)))
+    if os.path.isdir(section_dir):
+        for file_name in os.listdir(section_dir):
+            if file_name.endswith(".json") and file_name[:-len(".json")] not in sections:
+                os.remove(os.path.join(section_dir, file_name))
+    write_if_changed(os.path.join(search_dir, "index.json"), json_bytes({"version": SEARCH_INDEX_VERSION, "sections": shards}))
+
+def json_bytes(data):
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
@@ -0,0 +1,92 @@
+import os
+import shutil
+from compress import MINIFIERS
+from manifest import hash_file
+from output import write_if_changed
+
+class SyncStats:
+    def __init__(self):
+        self.copied_files = 0
+        self.copied_bytes = 0
+        self.skipped_files = 0
+        self.skipped_bytes = 0
+        self.pruned_files = 0
+
+    def __repr__(self):
+        return (
+            f"copied {self.copied_files} files ({self.copied_bytes} bytes), "
+            f"skipped {self.skipped_files} files ({self.skipped_bytes} bytes), "
+            f"pruned {self.pruned_files} files"
+        )
+
+def find_files(source_dir):
+    paths = []
+    for dir_path, dir_names, file_names in os.walk(source_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            paths.append(os.path.join(dir_path, file_name))
+    return paths
+
+def sync_static(source_dir, dest_dir, manifest, verify_hash = False, minify = False):
+    # copy only files whose size or mtime differ from their copy in dest_dir,
+    # and prune copies whose source was removed since the last sync; with
+    # minify, files with a minifier are minified on copy and compared by mtime
+    # alone since their size differs by design
+    stats = SyncStats()
+    synced = {}
+    for source in find_files(source_dir):
+        dest = os.path.join(dest_dir, os.path.relpath(source, source_dir))
+        source_stat = os.stat(source)
+        minifier = MINIFIERS.get(os.path.splitext(source)[1]) if minify else None
+        if minifier is not None and is_minified_up_to_date(source_stat, dest):
+            stats.skipped_files += 1
+            stats.skipped_bytes += source_stat.st_size
+        elif minifier is None and is_up_to_date(source, source_stat, dest, verify_hash):
+            stats.skipped_files += 1
+            stats.skipped_bytes += source_stat.st_size
+        elif minifier is not None:
+            copy_minified_file(source, source_stat, dest, minifier)
+            stats.copied_files += 1
+            stats.copied_bytes += source_stat.st_size
+        else:
+            copy_file(source, source_stat, dest)
+            stats.copied_files += 1
+            stats.copied_bytes += source_stat.st_size
+        synced[dest] = source
+    for dest in set(manifest.static) - set(synced):
+        if os.path.exists(dest):
+            os.remove(dest)
+            stats.pruned_files += 1
+    manifest.static = synced
+    return stats
+
+def is_up_to_date(source, source_stat, dest, verify_hash):
+    try:
+        dest_stat = os.stat(dest)
+    except FileNotFoundError:
+        return False
+    if dest_stat.st_size != source_stat.st_size:
+        return False
+    if dest_stat.st_mtime_ns == source_stat.st_mtime_ns:
+        return True
+    if verify_hash and hash_file(source) == hash_file(dest):
+        os.utime(dest, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        return True
+    return False
+
+def copy_file(source, source_stat, dest):
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    # copyfile uses os.sendfile where the platform supports it
+    shutil.copyfile(source, dest)
+    os.utime(dest, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+
+def is_minified_up_to_date(source_stat, dest):
+    try:
+        return os.stat(dest).st_mtime_ns == source_stat.st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+def copy_minified_file(source, source_stat, dest, minifier):
+    with open(source) as f:
+        write_if_changed(dest, minifier(f.read()).encode())
+    os.utime(dest, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
@@ -0,0 +1,83 @@
+import os
+import re
+
+# {{ Name }} is a slot filled per page, {{> name }} includes partials/name.html
+TAG_PATTERN = re.compile(r"\{\{\s*(>)?\s*([\w.-]+)\s*\}\}")
+PARTIALS_DIR = "partials"
+
+class Template:
+    def __init__(self, parts, slots, dependencies):
+        # literal text with None at each slot position, so rendering is one
+        # list copy, one assignment per slot and a single join
+        self.parts = parts
+        # (index into parts, variable name)
+        self.slots = slots
+        # every file read to compile the template, the template itself first
+        self.dependencies = dependencies
+
+    def render(self, variables):
+        parts = self.parts.copy()
+        for index, name in self.slots:
+            parts[index] = variables.get(name, "")
+        return ''.join(parts)
+
+def compile_template(text, partials_dir = PARTIALS_DIR, dependencies = None):
+    parts = []
+    slots = []
+    dependencies = [] if dependencies is None else dependencies
+    append_segments(text, partials_dir, parts, slots, dependencies, ())
+    return Template(parts, slots, dependencies)
+
+def append_segments(text, partials_dir, parts, slots, dependencies, including):
+    position = 0
+    for match in TAG_PATTERN.finditer(text):
+        append_literal(parts, slots, text[position:match.start()])
+        position = match.end()
+        name = match.group(2)
+        if match.group(1) is None:
+            slots.append((len(parts), name))
+            parts.append(None)
+            continue
+        path = os.path.join(partials_dir, name + ".html")
+        if path in including:
+            raise Exception(f"partial includes itself: '{name}'")
+        if path not in dependencies:
+            dependencies.append(path)
+        with open(path) as f:
+            partial = f.read()
+        append_segments(partial, partials_dir, parts, slots, dependencies, including + (path,))
+    append_literal(parts, slots, text[position:])
+
+def append_literal(parts, slots, literal):
+    if literal == "":
+        return
+    # merge with the previous literal so partials don't leave extra parts
+    if parts and (not slots or slots[-1][0] != len(parts) - 1):
+        parts[-1] += literal
+    else:
+        parts.append(literal)
+
+# path -> (mtimes and sizes of the template's dependencies, Template)
+template_cache = {}
+
+def load_template(path):
+    cached = template_cache.get(path)
+    if cached is not None and cached[0] == dependency_stamps(cached[1].dependencies):
+        return cached[1]
+    with open(path) as f:
+        text = f.read()
+    partials_dir = os.path.join(os.path.dirname(path), PARTIALS_DIR)
+    template = compile_template(text, partials_dir, [path])
+    template_cache[path] = (dependency_stamps(template.dependencies), template)
+    return template
+
+def dependency_stamps(paths):
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stamps.append(None)
+            continue
+        stamps.append((stat.st_mtime_ns, stat.st_size))
+    return stamps
@@ -0,0 +1,127 @@
+import os
+import sys
+import tempfile
+import unittest
+import astcache
+from astcache import DocumentCache, decode_document, enable_document_cache, encode_document, markdown_to_html_node_cached
+from functions import document_to_html_node, markdown_to_html_node, parse_document
+
+MARKDOWN = """# Title with **bold**
+
+A paragraph with `code`, a [link](/about) and ![an image](/images/a.png), plus ünïcode.
+
+> quoted _text_
+> over two lines
+
+- first item
+- second [item](https://example.com)
+
+1. one
+2. two
+
+```python
+def f(x):
+    return x
+```
+"""
+
+class DocumentFormatShould(unittest.TestCase):
+    def test_round_trip_every_block_and_text_type(self):
+        document = parse_document(MARKDOWN)
+        self.assertEqual(decode_document(encode_document(document)), document)
+
+    def test_round_trip_nested_quotes_and_lists(self):
+        document = parse_document("> a\n>\n> - b\n>   1. c\n>> d\n\n- e\n  - f\n    - g\n- h")
+        self.assertEqual(decode_document(encode_document(document)), document)
+
+    def test_round_trip_deep_nesting(self):
+        markdown = '\n'.join(">" * level + " x" for level in range(1, sys.getrecursionlimit() + 100))
+        document = decode_document(encode_document(parse_document(markdown)))
+        self.assertEqual(document_to_html_node(document).to_html(), markdown_to_html_node(markdown).to_html())
+
+    def test_round_trip_an_empty_document(self):
+        self.assertEqual(decode_document(encode_document([])), [])
+
+    def test_widen_arrays_for_long_strings(self):
+        document = parse_document("x" * 70000)
+        self.assertEqual(decode_document(encode_document(document)), document)
+
+    def test_reject_other_format_versions(self):
+        data = bytearray(encode_document(parse_document(MARKDOWN)))
+        data[4] += 1
+        with self.assertRaises(ValueError):
+            decode_document(bytes(data))
+        with self.assertRaises(ValueError):
+            decode_document(b"SSG")
+
+    def test_reject_truncated_and_extended_data(self):
+        data = encode_document(parse_document(MARKDOWN))
+        for size in range(len(data)):
+            with self.assertRaises(ValueError):
+                decode_document(data[:size])
+        with self.assertRaises(ValueError):
+            decode_document(data + b"\0")
+
+    def test_reject_damaged_codes_with_value_error(self):
+        data = encode_document(parse_document(MARKDOWN))
+        for position in range(len(data)):
+            damaged = bytearray(data)
+            damaged[position] = 0xFF
+            try:
+                decode_document(bytes(damaged))
+            except ValueError:
+                pass
+
+class DocumentCacheShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        enable_document_cache(None)
+        self.temp_dir.cleanup()
+
+    def test_render_the_same_html_from_the_cache(self):
+        enable_document_cache(self.temp_dir.name)
+        expected = markdown_to_html_node(MARKDOWN).to_html()
+        self.assertEqual(markdown_to_html_node_cached(MARKDOWN).to_html(), expected)
+        self.assertEqual(markdown_to_html_node_cached(MARKDOWN).to_html(), expected)
+        self.assertEqual((astcache.document_cache.hits, astcache.document_cache.misses), (1, 1))
+
+    def test_key_on_parser_version(self):
+        cache = DocumentCache(self.temp_dir.name)
+        path = cache.path_for(MARKDOWN)
+        astcache.PARSER_VERSION += 1
+        try:
+            self.assertNotEqual(cache.path_for(MARKDOWN), path)
+        finally:
+            astcache.PARSER_VERSION -= 1
+
+    def test_reparse_unreadable_entries(self):
+        enable_document_cache(self.temp_dir.name)
+        path = astcache.document_cache.path_for(MARKDOWN)
+        os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as f:
+            f.write(b"garbage")
+        self.assertEqual(astcache.document_cache.get_or_parse(MARKDOWN), parse_document(MARKDOWN))
+        self.assertEqual(astcache.document_cache.misses, 1)
+        with open(path, "rb") as f:
+            self.assertEqual(decode_document(f.read()), parse_document(MARKDOWN))
+
+    def test_reparse_truncated_entries(self):
+        enable_document_cache(self.temp_dir.name)
+        markdown_to_html_node_cached(MARKDOWN)
+        path = astcache.document_cache.path_for(MARKDOWN)
+        with open(path, "rb") as f:
+            data = f.read()
+        with open(path, "wb") as f:
+            f.write(data[:len(data) // 2])
+        self.assertEqual(astcache.document_cache.get_or_parse(MARKDOWN), parse_document(MARKDOWN))
+        self.assertEqual(astcache.document_cache.misses, 2)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), data)
+
+    def test_parse_directly_when_disabled(self):
+        self.assertEqual(markdown_to_html_node_cached(MARKDOWN).to_html(), markdown_to_html_node(MARKDOWN).to_html())
+
+if __name__ == "__main__":
+    unittest.main()
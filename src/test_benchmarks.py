@@ -0,0 +1,23 @@
+import os
+import tempfile
+import unittest
+from benchmarks import compare_results, load_baseline, merge_baseline, save_baseline
+
+class CompareResultsShould(unittest.TestCase):
+    def test_report_benchmarks_slower_than_threshold(self):
+        baseline = {"fast": 1.0, "slow": 1.0, "faster": 1.0}
+        results = {"fast": 1.2, "slow": 1.5, "faster": 0.5, "new": 9.0}
+        actual = compare_results(results, baseline, 0.25)
+        self.assertEqual(actual, [("slow", 1.0, 1.5, 1.5)])
+
+class MergeBaselineShould(unittest.TestCase):
+    def test_keep_entries_of_benchmarks_not_run(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "baseline.json")
+            self.assertEqual(merge_baseline(path, {"a": 1.0}), {"a": 1.0})
+            save_baseline(path, {"a": 1.0, "b": 2.0})
+            save_baseline(path, merge_baseline(path, {"b": 3.0}))
+            self.assertEqual(load_baseline(path), {"a": 1.0, "b": 3.0})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import os
+import tempfile
+import unittest
+import depgraph
+from build import generate_pages
+from manifest import BuildManifest
+from static import sync_static
+from textnode import set_image_variants
+
+TEMPLATE = "<title>{{ Title }}</title><main>{{ Content }}</main>"
+
+class GeneratePagesShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        self.content_dir = os.path.join(self.root, "content")
+        self.dest_dir = os.path.join(self.root, "public")
+        self.template_path = os.path.join(self.root, "template.html")
+        self.write(self.template_path, TEMPLATE)
+        self.write(os.path.join(self.content_dir, "index.md"), "# Home\n\nWelcome")
+        self.write(os.path.join(self.content_dir, "blog", "post.md"), "# Post\n\nSome *text*")
+        self.manifest_path = os.path.join(self.root, "manifest.json")
+
+    def tearDown(self):
+        set_image_variants({})
+        self.temp_dir.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def build(self, jobs = 1, reasons = None):
+        manifest = BuildManifest.load(self.manifest_path)
+        generated = generate_pages(self.content_dir, self.template_path, self.dest_dir, manifest, jobs, reasons)
+        manifest.save()
+        return sorted(os.path.relpath(dest, self.dest_dir) for dest in generated)
+
+    def test_write_pages_into_dest_dir(self):
+        self.assertEqual(self.build(), ["blog/post.html", "index.html"])
+        with open(os.path.join(self.dest_dir, "blog", "post.html")) as f:
+            self.assertEqual(f.read(), "<title>Post</title><main><div><h1>Post</h1><p>Some <i>text</i></p></div></main>")
+
+    def test_write_same_pages_with_worker_processes(self):
+        self.assertEqual(self.build(jobs = 2), ["blog/post.html", "index.html"])
+        with open(os.path.join(self.dest_dir, "blog", "post.html")) as f:
+            self.assertEqual(f.read(), "<title>Post</title><main><div><h1>Post</h1><p>Some <i>text</i></p></div></main>")
+        self.assertEqual(self.build(jobs = 2), [])
+
+    def test_skip_unchanged_pages(self):
+        self.build()
+        self.assertEqual(self.build(), [])
+
+    def test_rebuild_only_changed_source(self):
+        self.build()
+        self.write(os.path.join(self.content_dir, "index.md"), "# Home\n\nWelcome back")
+        self.assertEqual(self.build(), ["index.html"])
+
+    def test_rebuild_all_pages_when_template_changes(self):
+        self.build()
+        self.write(self.template_path, "<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertEqual(self.build(), ["blog/post.html", "index.html"])
+
+    def test_escape_title_and_front_matter_values(self):
+        self.write(self.template_path, "<title>{{ Title }}</title><meta content=\"{{ summary }}\">")
+        self.write(os.path.join(self.content_dir, "index.md"), "---\nsummary: \"quoted\" & <b>\n---\n# A < B")
+        self.build()
+        with open(os.path.join(self.dest_dir, "index.html")) as f:
+            self.assertEqual(f.read(), "<title>A &lt; B</title><meta content=\"&quot;quoted&quot; &amp; &lt;b&gt;\">")
+
+    def test_keep_mtime_of_pages_whose_minified_html_is_unchanged(self):
+        self.write(self.template_path, "<title>{{ Title }}</title> <main>{{ Content }}</main>")
+        self.build()
+        dest = os.path.join(self.dest_dir, "index.html")
+        os.utime(dest, ns=(1, 1))
+        self.write(self.template_path, "<title>{{ Title }}</title>   <main>{{ Content }}</main>")
+        self.assertEqual(self.build(), ["blog/post.html", "index.html"])
+        self.assertEqual(os.stat(dest).st_mtime_ns, 1)
+
+    def test_fill_front_matter_variables_and_partials(self):
+        self.write(self.template_path, "{{> header }}{{ Content }}")
+        self.write(os.path.join(self.root, "partials", "header.html"), "<h1>{{ Title }} by {{ author }}</h1>")
+        self.write(os.path.join(self.content_dir, "index.md"), "---\nTitle: Welcome\nauthor: Ada\n---\n# Home")
+        self.build()
+        with open(os.path.join(self.dest_dir, "index.html")) as f:
+            self.assertEqual(f.read(), "<h1>Welcome by Ada</h1><div><h1>Home</h1></div>")
+        self.write(os.path.join(self.root, "partials", "header.html"), "<h2>{{ Title }}</h2>")
+        self.assertEqual(self.build(), ["blog/post.html", "index.html"])
+
+    def test_rebuild_missing_output(self):
+        self.build()
+        os.remove(os.path.join(self.dest_dir, "index.html"))
+        self.assertEqual(self.build(), ["index.html"])
+
+    def test_remove_pages_whose_source_was_deleted(self):
+        self.build()
+        os.remove(os.path.join(self.content_dir, "blog", "post.md"))
+        self.build()
+        self.assertFalse(os.path.exists(os.path.join(self.dest_dir, "blog", "post.html")))
+
+    def test_explain_why_pages_were_rebuilt(self):
+        reasons = {}
+        self.build(reasons = reasons)
+        self.assertEqual(reasons[os.path.join(self.dest_dir, "index.html")], ["new page"])
+        self.write(self.template_path, "{{> header }}{{ Content }}")
+        self.write(os.path.join(self.root, "partials", "header.html"), "<h1>{{ Title }}</h1>")
+        self.write(os.path.join(self.content_dir, "index.md"), "# Home\n\nWelcome back")
+        reasons = {}
+        self.build(reasons = reasons)
+        self.assertEqual(reasons[os.path.join(self.dest_dir, "index.html")], [
+            "source changed",
+            f"{self.template_path} changed",
+            f"{os.path.join(self.root, 'partials', 'header.html')} added",
+        ])
+
+    def test_rebuild_all_pages_when_the_parser_version_changes(self):
+        self.build()
+        reasons = {}
+        version = depgraph.RENDER_VERSIONS["version:parser"]
+        depgraph.RENDER_VERSIONS["version:parser"] = version + "-next"
+        try:
+            self.assertEqual(self.build(reasons = reasons), ["blog/post.html", "index.html"])
+        finally:
+            depgraph.RENDER_VERSIONS["version:parser"] = version
+        self.assertEqual(reasons[os.path.join(self.dest_dir, "index.html")], ["version:parser changed"])
+
+    def test_rebuild_pages_showing_changed_static_images(self):
+        static_dir = os.path.join(self.root, "static")
+        image = os.path.join(static_dir, "logo.png")
+        self.write(image, "png")
+        self.write(os.path.join(self.content_dir, "index.md"), "# Home\n\n![logo](/logo.png)")
+        manifest = BuildManifest.load(self.manifest_path)
+        sync_static(static_dir, self.dest_dir, manifest)
+        manifest.save()
+        self.build()
+        self.write(image, "gif")
+        manifest = BuildManifest.load(self.manifest_path)
+        sync_static(static_dir, self.dest_dir, manifest)
+        reasons = {}
+        self.assertEqual(generate_pages(self.content_dir, self.template_path, self.dest_dir, manifest, 1, reasons), [os.path.join(self.dest_dir, "index.html")])
+        self.assertEqual(reasons[os.path.join(self.dest_dir, "index.html")], [f"{image} changed"])
+
+    def test_rebuild_pages_whose_image_attributes_changed(self):
+        self.write(os.path.join(self.content_dir, "index.md"), "# Home\n\n![logo](/logo.png)")
+        self.build()
+        set_image_variants({"/logo.png": {"width": "40", "height": "30"}})
+        reasons = {}
+        self.assertEqual(self.build(reasons = reasons), ["index.html"])
+        self.assertEqual(reasons[os.path.join(self.dest_dir, "index.html")], ["image:/logo.png added"])
+        with open(os.path.join(self.dest_dir, "index.html")) as f:
+            self.assertIn("<img src=\"/logo.png\" alt=\"logo\" width=\"40\" height=\"30\">", f.read())
+        self.assertEqual(self.build(), [])
+
+    def test_rebuild_pages_linking_to_added_or_removed_pages(self):
+        self.write(os.path.join(self.content_dir, "index.md"), "# Home\n\nSee [about](/about.html) and [post](blog/post.html)")
+        self.build()
+        self.write(os.path.join(self.content_dir, "about.md"), "# About")
+        reasons = {}
+        self.assertEqual(self.build(reasons = reasons), ["about.html", "index.html"])
+        self.assertEqual(reasons[os.path.join(self.dest_dir, "index.html")], ["linked page about.html added"])
+        self.write(os.path.join(self.content_dir, "blog", "post.md"), "# Post\n\nEdited")
+        self.assertEqual(self.build(), ["blog/post.html"])
+        os.remove(os.path.join(self.content_dir, "blog", "post.md"))
+        reasons = {}
+        self.assertEqual(self.build(reasons = reasons), ["index.html"])
+        self.assertEqual(reasons[os.path.join(self.dest_dir, "index.html")], ["linked page blog/post.html removed"])
+
+if __name__ == "__main__":
+    unittest.main()
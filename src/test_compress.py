@@ -0,0 +1,62 @@
+import gzip
+import os
+import tempfile
+import unittest
+from compress import compress_outputs, minify_css, minify_html
+from manifest import BuildManifest
+
+class MinifyHtmlShould(unittest.TestCase):
+    def test_collapse_whitespace_runs_in_text(self):
+        html = "<ul>\n    <li>a   b</li>\n\n    <li>\tc</li>\n</ul>"
+        self.assertEqual(minify_html(html), "<ul>\n<li>a b</li>\n<li> c</li>\n</ul>")
+
+    def test_keep_preformatted_text_attributes_and_no_break_spaces(self):
+        html = "<pre><code>x  =  1\n\n\ty</code></pre><p title=\"a   b\">c  d</p>"
+        self.assertEqual(minify_html(html), html)
+
+class MinifyCssShould(unittest.TestCase):
+    def test_drop_comments_and_whitespace_around_punctuation(self):
+        css = "/* theme */\nbody ,  p > a {\n    color : red ;\n    font: \"a  b\" ;\n}\na :hover { width: calc(1px + 2px); }\n"
+        self.assertEqual(minify_css(css), "body,p>a{color : red;font: \"a  b\";}a :hover{width: calc(1px + 2px);}")
+
+class CompressOutputsShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dest_dir = self.temp_dir.name
+        self.page = os.path.join(self.dest_dir, "index.html")
+        self.write(self.page, "<p>hello   world</p>\n")
+        self.manifest = BuildManifest()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w") as f:
+            f.write(text)
+
+    def test_write_gzip_sibling_and_leave_page_untouched(self):
+        os.utime(self.page, ns=(1, 1))
+        stats = compress_outputs(self.dest_dir, self.manifest)
+        self.assertEqual(stats.compressed_files, 1)
+        self.assertEqual(os.stat(self.page).st_mtime_ns, 1)
+        with gzip.open(self.page + ".gz", "rt") as f:
+            self.assertEqual(f.read(), "<p>hello   world</p>\n")
+
+    def test_skip_outputs_whose_bytes_are_unchanged(self):
+        compress_outputs(self.dest_dir, self.manifest)
+        os.utime(self.page + ".gz", ns=(1, 1))
+        self.write(self.page, "<p>hello   world</p>\n")
+        stats = compress_outputs(self.dest_dir, self.manifest)
+        self.assertEqual((stats.compressed_files, stats.skipped_files), (0, 1))
+        self.assertEqual(os.stat(self.page + ".gz").st_mtime_ns, 1)
+        self.write(self.page, "<p>changed</p>\n")
+        self.assertEqual(compress_outputs(self.dest_dir, self.manifest).compressed_files, 1)
+
+    def test_remove_siblings_of_removed_outputs(self):
+        compress_outputs(self.dest_dir, self.manifest)
+        os.remove(self.page)
+        compress_outputs(self.dest_dir, self.manifest)
+        self.assertEqual(os.listdir(self.dest_dir), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+from depgraph import dependent_pages, explain_page, reference_targets
+
+class ReferenceTargetsShould(unittest.TestCase):
+    def test_record_whether_internal_targets_exist(self):
+        outputs = {"index.html", "blog/index.html", "logo.png"}
+        actual = reference_targets("index.html", ["/blog", "missing.html", "https://boot.dev", "#top", "/logo.png"], outputs)
+        self.assertEqual(actual, {"blog": True, "missing.html": False, "logo.png": True})
+
+class ExplainPageShould(unittest.TestCase):
+    def test_report_new_page(self):
+        self.assertEqual(explain_page(None, "a.md", "a.html", {}, set()), ["new page"])
+
+class DependentPagesShould(unittest.TestCase):
+    def test_follow_input_and_reference_edges(self):
+        pages = {
+            "a.md": {"dest": "a.html", "inputs": {"a.md": "1", "template.html": "2"}, "links": {"blog": True}, "assets": {}},
+            "b.md": {"dest": "b.html", "inputs": {"b.md": "3"}, "links": {}, "assets": {"logo.png": False}},
+        }
+        self.assertEqual(dependent_pages(pages, {"template.html"}, ()), {"a.md"})
+        self.assertEqual(dependent_pages(pages, set(), {"blog/index.html"}), {"a.md"})
+        self.assertEqual(dependent_pages(pages, set(), {"logo.png"}), {"b.md"})
+        self.assertEqual(dependent_pages(pages, {"c.md"}, ()), set())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+from devserver import DevSite
+from images import PngImage, write_png
+from manifest import BuildManifest
+from textnode import set_image_variants
+
+class DevSiteShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = self.temp_dir.name
+        self.content_dir = os.path.join(root, "content")
+        self.static_dir = os.path.join(root, "static")
+        self.dest_dir = os.path.join(root, "public")
+        self.template_path = os.path.join(root, "template.html")
+        self.write(self.template_path, "<title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.content_dir, "index.md"), "# Home\n\nWelcome")
+        self.write(os.path.join(self.static_dir, "styles.css"), "body {}")
+        self.cache_dir = os.path.join(root, "cache")
+        self.site = DevSite(self.content_dir, self.template_path, self.static_dir, self.dest_dir, BuildManifest(), self.cache_dir)
+        self.site.build()
+
+    def tearDown(self):
+        set_image_variants({})
+        self.temp_dir.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb" if isinstance(text, bytes) else "w") as f:
+            f.write(text)
+
+    def write_png(self, path, width, height):
+        self.write(path, write_png(PngImage(width, height, 0, [bytes(width)] * height, [])))
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_render_changed_page(self):
+        source = os.path.join(self.content_dir, "index.md")
+        self.write(source, "# Home\n\nWelcome *back*")
+        self.site.apply_changes({source})
+        self.assertEqual(self.read(os.path.join(self.dest_dir, "index.html")),
+            "<title>Home</title><div><h1>Home</h1><p>Welcome <i>back</i></p></div>")
+
+    def test_render_new_page_and_remove_deleted_page(self):
+        source = os.path.join(self.content_dir, "blog", "post.md")
+        self.write(source, "# Post")
+        self.site.apply_changes({source})
+        self.assertTrue(os.path.exists(os.path.join(self.dest_dir, "blog", "post.html")))
+        os.remove(source)
+        self.site.apply_changes({source})
+        self.assertFalse(os.path.exists(os.path.join(self.dest_dir, "blog", "post.html")))
+
+    def test_keep_documents_of_every_page_from_the_first_build(self):
+        source = os.path.join(self.content_dir, "index.md")
+        self.assertEqual(set(self.site.documents), {source})
+        site = DevSite(self.content_dir, self.template_path, self.static_dir, self.dest_dir, self.site.manifest, self.cache_dir)
+        site.build()
+        self.assertEqual(set(site.documents), {source})
+
+    def test_rerender_cached_pages_when_template_changes(self):
+        source = os.path.join(self.content_dir, "index.md")
+        self.site.apply_changes({source})
+        self.write(self.template_path, "<h1>{{ Title }}</h1>")
+        self.site.apply_changes({self.template_path})
+        self.assertEqual(self.read(os.path.join(self.dest_dir, "index.html")), "<h1>Home</h1>")
+
+    def test_rerender_only_pages_referencing_added_or_removed_outputs(self):
+        source = os.path.join(self.content_dir, "index.md")
+        other = os.path.join(self.content_dir, "other.md")
+        self.write(source, "# Home\n\n![logo](/logo.png)")
+        self.write(other, "# Other")
+        self.site.apply_changes({source, other})
+        other_dest = os.path.join(self.dest_dir, "other.html")
+        self.assertEqual(self.site.manifest.pages[source]["assets"], {"logo.png": False})
+        os.remove(other_dest)
+        logo = os.path.join(self.static_dir, "logo.png")
+        self.write(logo, "png")
+        self.site.apply_changes({logo})
+        self.assertEqual(self.site.manifest.pages[source]["assets"], {"logo.png": True})
+        self.assertFalse(os.path.exists(other_dest))
+
+    def test_add_image_attributes_and_update_them_when_the_image_changes(self):
+        source = os.path.join(self.content_dir, "index.md")
+        image = os.path.join(self.static_dir, "wide.png")
+        self.write(source, "# Home\n\n![wide](/wide.png)")
+        self.write_png(image, 1000, 20)
+        self.site.apply_changes({source, image})
+        html = self.read(os.path.join(self.dest_dir, "index.html"))
+        self.assertIn("width=\"1000\" height=\"20\" srcset=\"/wide.480w.png 480w", html)
+        self.assertTrue(os.path.exists(os.path.join(self.dest_dir, "wide.480w.png")))
+        self.write_png(image, 40, 30)
+        self.site.apply_changes({image})
+        html = self.read(os.path.join(self.dest_dir, "index.html"))
+        self.assertIn("<img src=\"/wide.png\" alt=\"wide\" width=\"40\" height=\"30\">", html)
+        self.assertNotIn("srcset", html)
+
+    def test_sync_changed_static_files(self):
+        path = os.path.join(self.static_dir, "styles.css")
+        self.write(path, "p {}")
+        self.site.apply_changes({path})
+        self.assertEqual(self.read(os.path.join(self.dest_dir, "styles.css")), "p{}")
+
+if __name__ == "__main__":
+    unittest.main()
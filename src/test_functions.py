@@ -1,4 +1,7 @@
+import random
+import sys
 import unittest
+import functions
 from textnode import TextNode, TextType
 from functions import *
 
@@ -94,6 +97,19 @@ class ExtractMarkdownLinksShould(unittest.TestCase):
         actual = extract_markdown_links(text)
         self.assertEqual(actual, [])
 
+    def test_extract_links_with_nested_brackets_and_parentheses(self):
+        text = "See [the [draft] spec](https://en.wikipedia.org/wiki/Foo_(bar)) and [a](b)"
+        actual = extract_markdown_links(text)
+        expected = [
+            ("the [draft] spec", "https://en.wikipedia.org/wiki/Foo_(bar)"),
+            ("a", "b")
+        ]
+        self.assertEqual(actual, expected)
+
+    def test_not_backtrack_catastrophically_on_unclosed_brackets(self):
+        text = "[" * 5000 + "a](" * 5000 + "(b" * 5000
+        self.assertEqual(extract_markdown_links(text), [])
+
 class SplitNodesLinkShould(unittest.TestCase):
     def test_split_text_into_text_nodes_list(self):
         node = TextNode(
@@ -127,6 +143,15 @@ class SplitNodesLinkShould(unittest.TestCase):
         ]
         self.assertEqual(actual, expected)
 
+    def test_split_at_matched_link_not_earlier_identical_text(self):
+        node = TextNode("![foo](https://bar.baz) and [foo](https://bar.baz)", TextType.TEXT)
+        actual = split_nodes_link([node])
+        expected = [
+            TextNode("![foo](https://bar.baz) and ", TextType.TEXT),
+            TextNode("foo", TextType.LINK, "https://bar.baz")
+        ]
+        self.assertEqual(actual, expected)
+
     def test_not_return_empty_strings(self):
         node = TextNode("[foo](https://bar.baz)", TextType.TEXT)
         actual = split_nodes_link([node])
@@ -167,6 +192,21 @@ class TextToTextNodesShould(unittest.TestCase):
         ]
         self.assertEqual(actual, expected)
 
+    def test_match_reference_implementation_on_random_text(self):
+        fragments = ["a", "b c", " ", "*", "**", "`", "!", "[", "]", "(", ")", "\n",
+            "[link](https://foo.bar)", "![image](https://foo.bar/baz.png)", "[](empty)"]
+        rng = random.Random(1234)
+        for _ in range(5000):
+            text = ''.join(rng.choice(fragments) for _ in range(rng.randint(0, 12)))
+            try:
+                expected = text_to_textnodes_reference(text)
+            except Exception as e:
+                with self.assertRaises(Exception) as cm:
+                    text_to_textnodes(text)
+                self.assertEqual(str(cm.exception), str(e), text)
+                continue
+            self.assertEqual(text_to_textnodes(text), expected, text)
+
 class MarkDownToBlocksShould(unittest.TestCase):
     def test_split_markdown_into_blocks(self):
         markdown = "# This is a heading   \n \n" + \
@@ -227,6 +267,12 @@ class BlockToBlockTypeShould(unittest.TestCase):
             actual = block_to_block_type(blocks[i])
             self.assertEqual(actual, expected[i])
 
+    def test_keep_indentation_inside_code_blocks(self):
+        markdown = "```\ndef f():\n    if x:\n        return 1\n  ```"
+        actual = markdown_to_html_node(markdown).to_html()
+        expected = "<div><pre><code>def f():\n    if x:\n        return 1\n</code></pre></div>"
+        self.assertEqual(actual, expected)
+
     def test_convert_quote_blocks(self):
         blocks = [
             ">quote block",
@@ -279,3 +325,122 @@ class BlockToBlockTypeShould(unittest.TestCase):
         for i in range(0, len(blocks)):
             actual = block_to_block_type(blocks[i])
             self.assertEqual(actual, expected[i])
+
+    def test_match_reference_implementation_on_random_blocks(self):
+        rng = random.Random(1234)
+        for _ in range(5000):
+            lines = []
+            for i in range(rng.randint(1, 5)):
+                prefix = rng.choice(["", "# ", "#", "```", ">", "* ", "- ", "*", f"{i + 1}. ", f"{i + 2}. ", f"{i + 1}."])
+                lines.append(prefix + rng.choice(["", "text", "```"]))
+            block = '\n'.join(lines)
+            self.assertEqual(block_to_block_type(block), block_to_block_type_reference(block), block)
+
+class MarkdownToHtmlNodeShould(unittest.TestCase):
+    def test_convert_paragraphs(self):
+        markdown = "This is **bolded** paragraph\ntext in a p\ntag here\n\nThis is another paragraph with *italic* text and `code` here"
+        actual = markdown_to_html_node(markdown).to_html()
+        expected = "<div><p>This is <b>bolded</b> paragraph text in a p tag here</p>" + \
+            "<p>This is another paragraph with <i>italic</i> text and <code>code</code> here</p></div>"
+        self.assertEqual(actual, expected)
+
+    def test_convert_headings(self):
+        markdown = "# heading 1\n\n### heading *3*"
+        actual = markdown_to_html_node(markdown).to_html()
+        expected = "<div><h1>heading 1</h1><h3>heading <i>3</i></h3></div>"
+        self.assertEqual(actual, expected)
+
+    def test_convert_code_blocks_without_inline_parsing(self):
+        markdown = "```python\nThis is text that _should_ remain\nthe **same** even with inline stuff\n```"
+        actual = markdown_to_html_node(markdown).to_html()
+        expected = (
+            "<div><pre><code class=\"language-python\">This <span class=\"hl-keyword\">is</span> text that _should_ remain\n"
+            "the **same** even <span class=\"hl-keyword\">with</span> inline stuff\n</code></pre></div>"
+        )
+        self.assertEqual(actual, expected)
+
+    def test_convert_quote_blocks(self):
+        markdown = "> This is a\n> **quote**"
+        actual = markdown_to_html_node(markdown).to_html()
+        expected = "<div><blockquote>This is a <b>quote</b></blockquote></div>"
+        self.assertEqual(actual, expected)
+
+    def test_convert_lists(self):
+        markdown = "* item [one](https://foo.bar)\n- item two\n\n1. first\n2. second"
+        actual = markdown_to_html_node(markdown).to_html()
+        expected = "<div><ul><li>item <a href=\"https://foo.bar\">one</a></li><li>item two</li></ul>" + \
+            "<ol><li>first</li><li>second</li></ol></div>"
+        self.assertEqual(actual, expected)
+
+class NestedBlocksShould(unittest.TestCase):
+    def test_nest_lists_indented_to_the_item_text(self):
+        markdown = "- a\n  - b\n    - c\n  - d\n- e"
+        actual = markdown_to_html_node(markdown).to_html()
+        expected = "<div><ul><li>a<ul><li>b<ul><li>c</li></ul></li><li>d</li></ul></li><li>e</li></ul></div>"
+        self.assertEqual(actual, expected)
+
+    def test_nest_lists_of_other_types_and_count_each_from_one(self):
+        markdown = "1. a\n   - x\n   - y\n2. b\n   1. z"
+        actual = markdown_to_html_node(markdown).to_html()
+        expected = "<div><ol><li>a<ul><li>x</li><li>y</li></ul></li><li>b<ol><li>z</li></ol></li></ol></div>"
+        self.assertEqual(actual, expected)
+
+    def test_keep_items_indented_less_than_the_item_text_as_siblings(self):
+        self.assertEqual(markdown_to_html_node("- a\n - b").to_html(), "<div><ul><li>a</li><li>b</li></ul></div>")
+
+    def test_parse_invalid_nested_lists_as_before(self):
+        self.assertEqual(markdown_to_html_node("- a\n  text").to_html(), "<div><p>- a text</p></div>")
+        self.assertEqual(markdown_to_html_node("1. a\n   2. b").to_html(), "<div><ol><li>a</li><li>b</li></ol></div>")
+
+    def test_parse_blocks_inside_quotes(self):
+        markdown = "> intro **text**\n>\n> - one\n>   - nested\n> - two\n>\n> # Title"
+        actual = markdown_to_html_node(markdown).to_html()
+        expected = (
+            "<div><blockquote><p>intro <b>text</b></p>"
+            "<ul><li>one<ul><li>nested</li></ul></li><li>two</li></ul><h1>Title</h1></blockquote></div>"
+        )
+        self.assertEqual(actual, expected)
+
+    def test_nest_quotes_by_marker_count(self):
+        markdown = "> a\n>> b\n> > > c\n> d"
+        actual = markdown_to_html_node(markdown).to_html()
+        expected = "<div><blockquote><p>a</p><blockquote><p>b</p><blockquote>c</blockquote></blockquote><p>d</p></blockquote></div>"
+        self.assertEqual(actual, expected)
+
+    def test_not_hit_the_recursion_limit_on_deep_nesting(self):
+        depth = sys.getrecursionlimit() + 100
+        quotes = '\n'.join(">" * level + " x" for level in range(1, depth + 1))
+        html = markdown_to_html_node(quotes).to_html()
+        self.assertEqual(html.count("<blockquote>"), depth)
+        lists = '\n'.join("  " * level + "- x" for level in range(depth))
+        html = markdown_to_html_node(lists).to_html()
+        self.assertEqual(html.count("<ul>"), depth)
+        self.assertEqual(len(list(document_text_nodes(parse_document(quotes)))), depth)
+
+    def test_render_parsed_documents_like_markdown_to_html_node(self):
+        markdown = "# T\n\n> - a\n>   1. b\n\n- c\n  - d\n\n```\ncode\n```"
+        self.assertEqual(document_to_html_node(parse_document(markdown)).to_html(), markdown_to_html_node(markdown).to_html())
+
+class ParseCachesShould(unittest.TestCase):
+    def tearDown(self):
+        enable_parse_caches(0)
+
+    def test_return_shared_frozen_text_nodes(self):
+        enable_parse_caches(8)
+        text = "This is **text** with a [link](https://boot.dev)"
+        first = text_to_textnodes_cached(text)
+        second = text_to_textnodes_cached(text)
+        self.assertIs(first, second)
+        self.assertEqual(list(first), text_to_textnodes(text))
+        with self.assertRaises(AttributeError):
+            first[0].text = "changed"
+        with self.assertRaises(TypeError):
+            first[0] = TextNode("changed", TextType.TEXT)
+
+    def test_render_same_html_with_caches(self):
+        markdown = "# Title\n\nA **footer**\n\n* item\n* item\n\nA **footer**"
+        expected = markdown_to_html_node(markdown).to_html()
+        enable_parse_caches(8)
+        self.assertEqual(markdown_to_html_node(markdown).to_html(), expected)
+        self.assertEqual(markdown_to_html_node(markdown).to_html(), expected)
+        self.assertEqual((functions.block_cache.hits, functions.block_cache.misses), (5, 3))
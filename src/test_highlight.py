@@ -0,0 +1,63 @@
+import tempfile
+import unittest
+import highlight
+from functions import markdown_to_html_node
+from highlight import HighlightCache, enable_highlight_cache, highlight_code
+
+class HighlightShould(unittest.TestCase):
+    def test_wrap_python_tokens_in_spans(self):
+        actual = highlight.highlight("python", "def f(x):  # add\n    return x + 1 < 'a'")
+        expected = (
+            "<span class=\"hl-keyword\">def</span> f(x):  <span class=\"hl-comment\"># add</span>\n"
+            "    <span class=\"hl-keyword\">return</span> x + <span class=\"hl-number\">1</span> &lt; "
+            "<span class=\"hl-string\">'a'</span>"
+        )
+        self.assertEqual(actual, expected)
+
+    def test_not_match_keywords_inside_names_or_strings(self):
+        actual = highlight.highlight("js", "const iffy = \"if else\";")
+        expected = "<span class=\"hl-keyword\">const</span> iffy = <span class=\"hl-string\">\"if else\"</span>;"
+        self.assertEqual(actual, expected)
+
+    def test_return_none_for_unknown_languages(self):
+        self.assertIsNone(highlight_code("cobol", "DISPLAY 'HI'."))
+
+class HighlightCacheShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        enable_highlight_cache(None)
+        self.temp_dir.cleanup()
+
+    def test_reuse_results_from_disk(self):
+        enable_highlight_cache(self.temp_dir.name)
+        first = highlight_code("sh", "echo $HOME")
+        enable_highlight_cache(self.temp_dir.name)
+        self.assertEqual(highlight_code("sh", "echo $HOME"), first)
+        self.assertEqual((highlight.highlight_cache.hits, highlight.highlight_cache.misses), (1, 0))
+
+    def test_key_on_highlighter_version(self):
+        cache = HighlightCache(self.temp_dir.name)
+        path = cache.path_for("python", "x = 1")
+        highlight.HIGHLIGHTER_VERSION += 1
+        try:
+            self.assertNotEqual(cache.path_for("python", "x = 1"), path)
+        finally:
+            highlight.HIGHLIGHTER_VERSION -= 1
+
+class HighlightCodeBlockShould(unittest.TestCase):
+    def test_render_language_class_and_highlighted_code(self):
+        html = markdown_to_html_node("```json\n{\"a\": true}\n```").to_html()
+        expected = (
+            "<div><pre><code class=\"language-json\">{<span class=\"hl-string\">\"a\"</span>: "
+            "<span class=\"hl-keyword\">true</span>}\n</code></pre></div>"
+        )
+        self.assertEqual(html, expected)
+
+    def test_render_unknown_languages_as_plain_code(self):
+        html = markdown_to_html_node("```text\na < b\n```").to_html()
+        self.assertEqual(html, "<div><pre><code>a &lt; b\n</code></pre></div>")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from htmlnode import HTMLNode
+from htmlnode import FrozenProps, HTMLNode, escape_attribute, escape_text
 
 class TestHTMLNode(unittest.TestCase):
     def test_props_to_html(self):
@@ -33,5 +33,27 @@ class TestHTMLNode(unittest.TestCase):
         node = HTMLNode()
         self.assertRaises(NotImplementedError, lambda: node.to_html())
 
+    def test_intern_tag(self):
+        tag = ''.join(["d", "iv"])
+        node = HTMLNode(tag)
+        self.assertIs(node.tag, HTMLNode("div").tag)
+
+    def test_not_have_instance_dict(self):
+        node = HTMLNode("p", "foo")
+        self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_escape_text_and_attributes(self):
+        text = "plain text"
+        self.assertIs(escape_text(text), text)
+        self.assertEqual(escape_text("a < b && c > \"d\""), "a &lt; b &amp;&amp; c &gt; \"d\"")
+        self.assertEqual(escape_attribute("say \"hi\" & <bye>"), "say &quot;hi&quot; &amp; &lt;bye&gt;")
+
+    def test_render_frozen_props_once(self):
+        props = FrozenProps(href="/a&b")
+        self.assertEqual(HTMLNode("a", props = props).props_to_html(), "href=\"/a&amp;b\"")
+        self.assertEqual(props, {"href": "/a&b"})
+        with self.assertRaises(TypeError):
+            props["href"] = "/c"
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,134 @@
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+import images
+from functions import markdown_to_html_node
+from images import PNG_SIGNATURE, RESIZER, PngImage, image_size, process_images, read_png, write_png
+from manifest import BuildManifest
+from static import sync_static
+from textnode import set_image_variants
+
+def gradient_png(width, height):
+    rows = [bytes((x + y) % 256 for x in range(width) for _ in range(3)) for y in range(height)]
+    return write_png(PngImage(width, height, 2, rows, []))
+
+def paeth(left, up, upper_left):
+    estimate = left + up - upper_left
+    distances = [abs(estimate - left), abs(estimate - up), abs(estimate - upper_left)]
+    return (left, up, upper_left)[distances.index(min(distances))]
+
+def filter_row(filter_type, row, previous, channels):
+    # the encoder side of each png filter, to check decoding against
+    filtered = bytearray(len(row))
+    for i in range(len(row)):
+        left = row[i - channels] if i >= channels else 0
+        upper_left = previous[i - channels] if i >= channels else 0
+        predictor = [0, left, previous[i], (left + previous[i]) >> 1, paeth(left, previous[i], upper_left)][filter_type]
+        filtered[i] = (row[i] - predictor) & 0xFF
+    return bytes([filter_type]) + filtered
+
+class ReadPngShould(unittest.TestCase):
+    def test_undo_every_filter_type(self):
+        rows = [bytes((x * 7 + y * 13) % 256 for x in range(12)) for y in range(5)]
+        previous = bytes(12)
+        raw = b""
+        for y, row in enumerate(rows):
+            raw += filter_row(y, row, previous, 3)
+            previous = row
+        header = write_png(PngImage(4, 5, 2, rows, []))[:33]
+        idat = zlib.compress(raw)
+        data = header + struct.pack(">I", len(idat)) + b"IDAT" + idat + struct.pack(">I", zlib.crc32(b"IDAT" + idat))
+        self.assertEqual([bytes(row) for row in read_png(data).rows], rows)
+
+    def test_read_size_from_headers(self):
+        self.assertEqual(image_size(gradient_png(30, 20)), (30, 20))
+        self.assertEqual(image_size(b"GIF89a" + struct.pack("<HH", 7, 9)), (7, 9))
+        jpeg = b"\xff\xd8" + b"\xff\xe0\x00\x04\x00\x00" + b"\xff\xc0\x00\x0b\x08" + struct.pack(">HH", 40, 60) + b"\x03"
+        self.assertEqual(image_size(jpeg), (60, 40))
+        self.assertIsNone(image_size(b"not an image"))
+
+    def test_return_none_for_truncated_or_corrupt_files(self):
+        data = gradient_png(30, 20)
+        for size in (len(PNG_SIGNATURE), 20, 33, len(data) - 20):
+            self.assertIsNone(read_png(data[:size]))
+        self.assertIsNone(image_size(PNG_SIGNATURE))
+        self.assertIsNone(image_size(b"GIF89a\x07"))
+        self.assertIsNone(read_png(data[:37] + b"\0" * (len(data) - 37)))
+
+class ProcessImagesShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = self.temp_dir.name
+        self.content_dir = os.path.join(root, "content")
+        self.static_dir = os.path.join(root, "static")
+        self.dest_dir = os.path.join(root, "public")
+        self.cache_dir = os.path.join(root, "cache")
+        self.write(os.path.join(self.content_dir, "index.md"), b"# Home\n\n![wide](/images/wide.png) ![small](/small.png)")
+        self.write(os.path.join(self.static_dir, "images", "wide.png"), gradient_png(1000, 20))
+        self.write(os.path.join(self.static_dir, "small.png"), gradient_png(40, 30))
+        self.manifest = BuildManifest()
+        sync_static(self.static_dir, self.dest_dir, self.manifest)
+
+    def tearDown(self):
+        set_image_variants({})
+        self.temp_dir.cleanup()
+
+    def write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def process(self):
+        return process_images(self.content_dir, self.dest_dir, self.manifest, self.cache_dir)
+
+    def test_write_derivatives_and_add_size_attributes(self):
+        stats = self.process()
+        self.assertEqual((stats.images, stats.generated, stats.reused), (2, 2, 0))
+        with open(os.path.join(self.dest_dir, "images", "wide.480w.png"), "rb") as f:
+            self.assertEqual(image_size(f.read()), (480, 10))
+        html = markdown_to_html_node("![wide](/images/wide.png) ![small](/small.png)").to_html()
+        self.assertEqual(html, (
+            "<div><p><img src=\"/images/wide.png\" alt=\"wide\" width=\"1000\" height=\"20\" "
+            "srcset=\"/images/wide.480w.png 480w, /images/wide.960w.png 960w, /images/wide.png 1000w\"></img> "
+            "<img src=\"/small.png\" alt=\"small\" width=\"40\" height=\"30\"></img></p></div>"
+        ))
+
+    def test_skip_corrupt_images(self):
+        self.write(os.path.join(self.static_dir, "small.png"), PNG_SIGNATURE)
+        sync_static(self.static_dir, self.dest_dir, self.manifest)
+        stats = self.process()
+        self.assertEqual((stats.images, stats.generated), (2, 2))
+        html = markdown_to_html_node("![small](/small.png)").to_html()
+        self.assertEqual(html, "<div><p><img src=\"/small.png\" alt=\"small\"></img></p></div>")
+
+    def test_record_images_that_could_not_be_resized(self):
+        path = os.path.join(self.static_dir, "images", "wide.png")
+        self.write(path, gradient_png(1000, 20)[:33])
+        sync_static(self.static_dir, self.dest_dir, self.manifest)
+        stats = self.process()
+        self.assertEqual((stats.generated, stats.unsupported), (0, 1))
+        self.assertEqual(self.manifest.images[path][3], RESIZER)
+        make_derivative = images.make_derivative
+        images.make_derivative = lambda *args: self.fail("resized again")
+        try:
+            self.assertEqual(self.process().unsupported, 1)
+        finally:
+            images.make_derivative = make_derivative
+        html = markdown_to_html_node("![wide](/images/wide.png)").to_html()
+        self.assertEqual(html, "<div><p><img src=\"/images/wide.png\" alt=\"wide\" width=\"1000\" height=\"20\"></img></p></div>")
+
+    def test_reuse_cached_derivatives(self):
+        self.process()
+        self.assertEqual((self.process().generated, self.process().reused), (0, 2))
+
+    def test_remove_derivatives_no_longer_referenced(self):
+        self.process()
+        self.write(os.path.join(self.content_dir, "index.md"), b"# Home")
+        self.process()
+        self.assertFalse(os.path.exists(os.path.join(self.dest_dir, "images", "wide.480w.png")))
+        self.assertEqual(self.manifest.derived, {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import threading
+import unittest
+import functions
+import instrumentation
+from parentnode import ParentNode
+
+class InstrumentationShould(unittest.TestCase):
+    def tearDown(self):
+        instrumentation.uninstrument()
+        instrumentation.reset()
+
+    def test_record_calls_nodes_and_bytes_per_stage(self):
+        instrumentation.instrument()
+        html = functions.markdown_to_html_node("# Title\n\nSome **bold** text").to_html()
+        stages = instrumentation.stages
+        self.assertEqual(stages["block splitting"].calls, 1)
+        self.assertEqual(stages["block splitting"].nodes, 2)
+        self.assertEqual(stages["classification"].calls, 2)
+        self.assertEqual(stages["inline parsing"].nodes, 4)
+        self.assertEqual(stages["html nodes"].calls, 4)
+        self.assertEqual(stages["serialization"].bytes, len(html))
+        self.assertIn("inline parsing", instrumentation.report())
+
+    def test_align_report_columns(self):
+        instrumentation.instrument()
+        functions.markdown_to_html_node("# Title")
+        lines = instrumentation.report().split('\n')
+        self.assertEqual({len(line) for line in lines}, {len(lines[0])})
+
+    def test_count_calls_made_from_several_threads(self):
+        instrumentation.instrument()
+        def parse():
+            for _ in range(200):
+                functions.text_to_textnodes("Some **bold** text")
+        threads = [threading.Thread(target=parse) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = instrumentation.stages["inline parsing"]
+        self.assertEqual((stats.calls, stats.nodes), (800, 2400))
+
+    def test_restore_original_functions(self):
+        original = functions.text_to_textnodes
+        original_to_html = ParentNode.to_html
+        instrumentation.instrument()
+        self.assertIsNot(functions.text_to_textnodes, original)
+        instrumentation.uninstrument()
+        self.assertIs(functions.text_to_textnodes, original)
+        self.assertIs(ParentNode.to_html, original_to_html)
+
+if __name__ == "__main__":
+    unittest.main()
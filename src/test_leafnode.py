@@ -24,5 +24,11 @@ class TestLeafNode(unittest.TestCase):
         expected = "<tag>value</tag>"
         self.assertEqual(actual, expected)
 
+    def test_to_html_should_escape_value_and_attributes(self):
+        leaf = LeafNode("a", "<b> & co", { "href": "/?a=1&b=\"2\"" })
+        actual = leaf.to_html()
+        expected = "<a href=\"/?a=1&amp;b=&quot;2&quot;\">&lt;b&gt; &amp; co</a>"
+        self.assertEqual(actual, expected)
+
 if __name__ == "__main__":
     unittest.main()
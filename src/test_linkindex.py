@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from linkindex import LinkIndex, build_link_index, extract_page_references, find_broken_references, list_outputs, resolve_url
+from manifest import BuildManifest
+
+class ResolveUrlShould(unittest.TestCase):
+    def test_resolve_relative_and_absolute_paths(self):
+        self.assertEqual(resolve_url("blog/post.html", "other.html"), "blog/other.html")
+        self.assertEqual(resolve_url("blog/post.html", "../index.html#top"), "index.html")
+        self.assertEqual(resolve_url("blog/post.html", "/images/a%20b.png"), "images/a b.png")
+        self.assertEqual(resolve_url("blog/post.html", "/"), "index.html")
+        self.assertEqual(resolve_url("index.html", "blog/"), "blog/index.html")
+        self.assertEqual(resolve_url("blog/post.html", "#section"), "blog/post.html")
+
+    def test_ignore_external_urls(self):
+        self.assertIsNone(resolve_url("index.html", "https://boot.dev"))
+        self.assertIsNone(resolve_url("index.html", "mailto:someone@example.com"))
+        self.assertIsNone(resolve_url("index.html", "//cdn.example.com/a.js"))
+
+class ExtractPageReferencesShould(unittest.TestCase):
+    def test_return_link_and_image_urls_outside_code_blocks(self):
+        markdown = "# Title\n\nA [link](/a.html) and ![img](/b.png)\n\n```\n[not](/c.html)\n```\n\n* [item](d.html)"
+        self.assertEqual(extract_page_references(markdown), (["/a.html", "d.html"], ["/b.png"]))
+
+    def test_skip_inline_code_and_find_nested_references_in_order(self):
+        markdown = "# Title\n\nSee `[x](/code.html)` and [a](/a.html)\n\n> - [b](/b.html)\n>   - [c](/c.html)\n> [d](/d.html)\n\n[e](/e.html)"
+        self.assertEqual(extract_page_references(markdown), (["/a.html", "/b.html", "/c.html", "/d.html", "/e.html"], []))
+
+class FindBrokenReferencesShould(unittest.TestCase):
+    def test_report_links_and_images_missing_from_outputs(self):
+        index = LinkIndex()
+        index.add_page("index.html", ["blog/", "missing.html", "https://boot.dev"], ["/logo.png", "/gone.png"])
+        index.add_page("blog/index.html", ["../index.html"], [])
+        outputs = {"index.html", "blog/index.html", "logo.png"}
+        actual = find_broken_references(index, outputs)
+        self.assertEqual(actual, [("index.html", "link", "missing.html"), ("index.html", "image", "/gone.png")])
+
+    def test_expose_reverse_links(self):
+        index = LinkIndex()
+        index.add_page("index.html", ["blog/post.html"], [])
+        index.add_page("about.html", ["/blog/post.html", "index.html"], [])
+        reverse = index.reverse_links()
+        self.assertEqual(reverse["blog/post.html"], {"index.html", "about.html"})
+        self.assertEqual(reverse["index.html"], {"about.html"})
+
+class BuildLinkIndexShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.content_dir = os.path.join(self.temp_dir.name, "content")
+        self.dest_dir = os.path.join(self.temp_dir.name, "public")
+        self.write(os.path.join(self.content_dir, "index.md"), "# Home\n\n[post](blog/post.html)")
+        self.write(os.path.join(self.content_dir, "blog", "post.md"), "# Post\n\n![logo](/logo.png)")
+        self.write(os.path.join(self.dest_dir, "index.html"), "")
+        self.write(os.path.join(self.dest_dir, "blog", "post.html"), "")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def test_index_pages_by_output_path(self):
+        manifest = BuildManifest()
+        index = build_link_index(self.content_dir, self.dest_dir, manifest)
+        self.assertEqual(index.links["index.html"], [("blog/post.html", "blog/post.html")])
+        self.assertEqual(index.images["blog/post.html"], [("/logo.png", "logo.png")])
+        broken = find_broken_references(index, list_outputs(self.dest_dir))
+        self.assertEqual(broken, [("blog/post.html", "image", "/logo.png")])
+
+    def test_reuse_references_of_unchanged_pages(self):
+        manifest = BuildManifest()
+        build_link_index(self.content_dir, self.dest_dir, manifest)
+        source = os.path.join(self.content_dir, "index.md")
+        manifest.links[source][1] = ["cached.html"]
+        index = build_link_index(self.content_dir, self.dest_dir, manifest)
+        self.assertEqual(index.links["index.html"], [("cached.html", "cached.html")])
+
+if __name__ == "__main__":
+    unittest.main()
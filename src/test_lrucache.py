@@ -0,0 +1,24 @@
+import unittest
+from lrucache import LRUCache
+
+class LRUCacheShould(unittest.TestCase):
+    def test_compute_missing_values_once(self):
+        cache = LRUCache(2)
+        calls = []
+        compute = lambda: calls.append(1) or "value"
+        self.assertEqual(cache.get_or_compute("key", compute), "value")
+        self.assertEqual(cache.get_or_compute("key", compute), "value")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (1, 1, 0))
+
+    def test_evict_least_recently_used_entry(self):
+        cache = LRUCache(2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("c", lambda: 3)
+        self.assertEqual(list(cache.entries), ["a", "c"])
+        self.assertEqual(cache.evictions, 1)
+
+if __name__ == "__main__":
+    unittest.main()
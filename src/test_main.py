@@ -0,0 +1,34 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import unittest
+import main
+
+class MainShould(unittest.TestCase):
+    def test_import_no_subsystem_until_a_command_runs(self):
+        code = "import sys, main; print(' '.join(sorted(sys.modules)))"
+        result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(main.__file__)), capture_output=True, text=True, check=True)
+        loaded = set(result.stdout.split())
+        for module in ("functions", "build", "compress", "images", "linkindex", "manifest", "highlight", "benchmarks", "devserver"):
+            self.assertNotIn(module, loaded)
+
+    def test_default_to_build_when_arguments_start_with_an_option(self):
+        self.assertEqual(main.with_default_command([]), ["build"])
+        self.assertEqual(main.with_default_command(["--jobs", "4"]), ["build", "--jobs", "4"])
+        self.assertEqual(main.with_default_command(["check"]), ["check"])
+        self.assertEqual(main.with_default_command(["--help"]), ["--help"])
+
+    def test_reject_options_other_commands_do_not_take(self):
+        with contextlib.redirect_stderr(io.StringIO()) as stderr, self.assertRaises(SystemExit):
+            main.main(["check", "--filter", "site"])
+        self.assertIn("unrecognized arguments: --filter site", stderr.getvalue())
+
+    def test_reject_compress_levels_gzip_does_not_take(self):
+        with contextlib.redirect_stderr(io.StringIO()) as stderr, self.assertRaises(SystemExit):
+            main.main(["build", "--compress-level", "12"])
+        self.assertIn("invalid choice: 12", stderr.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+from manifest import BuildManifest, hash_bytes
+
+class BuildManifestShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "manifest.json")
+        self.file_path = os.path.join(self.temp_dir.name, "page.md")
+        with open(self.file_path, "w") as f:
+            f.write("# Page")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_digest_file_contents(self):
+        manifest = BuildManifest(self.path)
+        self.assertEqual(manifest.digest(self.file_path), hash_bytes(b"# Page"))
+
+    def test_round_trip_through_disk(self):
+        manifest = BuildManifest(self.path)
+        digest = manifest.digest(self.file_path)
+        manifest.record_page(self.file_path, "page.html", {self.file_path: digest})
+        manifest.save()
+        loaded = BuildManifest.load(self.path)
+        self.assertEqual(loaded.files, manifest.files)
+        self.assertEqual(loaded.pages, manifest.pages)
+
+    def test_start_empty_if_file_is_missing_or_corrupt(self):
+        self.assertEqual(BuildManifest.load(self.path).pages, {})
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        self.assertEqual(BuildManifest.load(self.path).pages, {})
+
+if __name__ == "__main__":
+    unittest.main()
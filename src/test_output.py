@@ -0,0 +1,68 @@
+import os
+import tempfile
+import threading
+import unittest
+from output import OutputQueue, write_if_changed
+
+class WriteIfChangedShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "blog", "post.html")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_create_directories_and_leave_no_temp_file(self):
+        self.assertTrue(write_if_changed(self.path, b"<p>post</p>"))
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"<p>post</p>")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["post.html"])
+
+    def test_skip_identical_bytes_without_touching_mtime(self):
+        write_if_changed(self.path, b"<p>post</p>")
+        os.utime(self.path, ns=(1, 1))
+        self.assertFalse(write_if_changed(self.path, b"<p>post</p>"))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1)
+        self.assertTrue(write_if_changed(self.path, b"<p>edit</p>"))
+        self.assertNotEqual(os.stat(self.path).st_mtime_ns, 1)
+
+class OutputQueueShould(unittest.TestCase):
+    def test_finish_all_writes_on_close(self):
+        with tempfile.TemporaryDirectory() as root:
+            paths = [os.path.join(root, f"{i}.html") for i in range(50)]
+            with OutputQueue(max_workers = 4, max_pending = 2) as output:
+                for path in paths:
+                    output.put(write_if_changed, path, path.encode())
+            for path in paths:
+                with open(path, "rb") as f:
+                    self.assertEqual(f.read(), path.encode())
+
+    def test_bound_pending_writes(self):
+        release = threading.Event()
+        running = []
+        def write(index):
+            running.append(index)
+            release.wait()
+        output = OutputQueue(max_workers = 1, max_pending = 2)
+        output.put(write, 0)
+        output.put(write, 1)
+        producer = threading.Thread(target=output.put, args=(write, 2))
+        producer.start()
+        producer.join(0.05)
+        self.assertTrue(producer.is_alive())
+        release.set()
+        producer.join()
+        output.close()
+        self.assertEqual(running, [0, 1, 2])
+
+    def test_raise_first_write_error_on_close(self):
+        def fail():
+            raise OSError("disk full")
+        output = OutputQueue()
+        output.put(fail)
+        with self.assertRaises(OSError) as cm:
+            output.close()
+        self.assertEqual(str(cm.exception), "disk full")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from pages import extract_title, split_front_matter
+
+class ExtractTitleShould(unittest.TestCase):
+    def test_return_h1_header(self):
+        self.assertEqual(extract_title("intro\n\n#  Hello  \n\n## Sub"), "Hello")
+
+    def test_raise_exception_if_no_h1_header(self):
+        with self.assertRaises(Exception) as cm:
+            extract_title("## Sub\n\ntext")
+        self.assertEqual(str(cm.exception), "markdown must have an h1 header")
+
+class SplitFrontMatterShould(unittest.TestCase):
+    def test_return_variables_and_body(self):
+        markdown = "---\nTitle: Custom title\nauthor:  Ada \n---\n# Heading\n\ntext"
+        actual = split_front_matter(markdown)
+        expected = ({"Title": "Custom title", "author": "Ada"}, "# Heading\n\ntext")
+        self.assertEqual(actual, expected)
+
+    def test_return_markdown_unchanged_without_front_matter(self):
+        markdown = "# Heading\n\n---\n"
+        self.assertEqual(split_front_matter(markdown), ({}, markdown))
+
+    def test_raise_exception_on_invalid_line(self):
+        with self.assertRaises(Exception) as cm:
+            split_front_matter("---\nnot a pair\n---\n")
+        self.assertEqual(str(cm.exception), "invalid front matter line: 'not a pair'")
+
+if __name__ == "__main__":
+    unittest.main()
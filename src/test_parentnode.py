@@ -1,3 +1,4 @@
+import io
 import unittest
 from parentnode import ParentNode
 from leafnode import LeafNode
@@ -50,5 +51,31 @@ class TestParentNode(unittest.TestCase):
         expected = "<p><b>bold text</b>normal text<i>italic text</i>normal text<ul><li>list item</li></ul></p>"
         self.assertEqual(actual, expected)
 
+    def test_to_html_should_render_trees_deeper_than_recursion_limit(self):
+        node = LeafNode(None, "text")
+        for _ in range(5000):
+            node = ParentNode("div", [node])
+        actual = node.to_html()
+        expected = "<div>" * 5000 + "text" + "</div>" * 5000
+        self.assertEqual(actual, expected)
+
+    def test_write_html_should_write_html_to_stream(self):
+        parent = ParentNode(
+            "ul",
+            [
+                LeafNode("li", "item 1"),
+                LeafNode("li", "item 2")
+            ]
+        )
+        stream = io.StringIO()
+        parent.write_html(stream)
+        self.assertEqual(stream.getvalue(), parent.to_html())
+
+    def test_to_html_should_raise_value_error_if_nested_parent_has_no_tag(self):
+        parent = ParentNode("div", [ParentNode(None, [])])
+        with self.assertRaises(ValueError) as cm:
+            parent.to_html()
+        self.assertEqual(str(cm.exception), "parent node must have a tag")
+
 if __name__ == "__main__":
     unittest.main()
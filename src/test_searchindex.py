@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import unittest
+import astcache
+from astcache import enable_document_cache, markdown_to_html_node_cached
+from manifest import BuildManifest
+from searchindex import build_search_index, decode_postings, encode_section, page_terms
+
+class PageTermsShould(unittest.TestCase):
+    def test_count_words_of_text_nodes_outside_code(self):
+        markdown = "# Hello World\n\nSay **hello** to [the docs](/docs.html)\n\n```\nignored code\n```\n\n1. step one"
+        title, terms = page_terms(markdown)
+        self.assertEqual(title, "Hello World")
+        self.assertEqual(terms, {"hello": 2, "world": 1, "say": 1, "to": 1, "the": 1, "docs": 1, "step": 1, "one": 1})
+
+    def test_count_words_of_nested_lists_and_quotes(self):
+        _, terms = page_terms("# T\n\n- outer\n  - inner\n\n> quoted\n>> deeper")
+        self.assertEqual(terms, {"t": 1, "outer": 1, "inner": 1, "quoted": 1, "deeper": 1})
+
+    def test_load_pages_parsed_for_rendering_from_the_document_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            enable_document_cache(cache_dir)
+            try:
+                markdown_to_html_node_cached("# T\n\nbody")
+                self.assertEqual(page_terms("# T\n\nbody")[1], {"t": 1, "body": 1})
+                self.assertEqual((astcache.document_cache.hits, astcache.document_cache.misses), (1, 1))
+            finally:
+                enable_document_cache(None)
+
+class EncodeSectionShould(unittest.TestCase):
+    def test_delta_encode_postings_of_sorted_pages(self):
+        section = encode_section([
+            ("/c.html", "C", {"x": 1}),
+            ("/a.html", "A", {"x": 2, "y": 1}),
+            ("/b.html", "B", {"y": 3}),
+        ])
+        self.assertEqual(section["pages"], [["/a.html", "A"], ["/b.html", "B"], ["/c.html", "C"]])
+        self.assertEqual(section["terms"], {"x": [0, 2, 2, 1], "y": [0, 1, 1, 3]})
+        self.assertEqual(decode_postings(section["terms"]["x"]), [(0, 2), (2, 1)])
+
+class BuildSearchIndexShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.content_dir = os.path.join(self.temp_dir.name, "content")
+        self.dest_dir = os.path.join(self.temp_dir.name, "public")
+        self.manifest = BuildManifest()
+        self.write("index.md", "# Home\n\nWelcome")
+        self.write("blog/post.md", "# Post\n\nWelcome back")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.content_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read(self, name):
+        with open(os.path.join(self.dest_dir, "search", name)) as f:
+            return json.load(f)
+
+    def test_write_a_shard_per_section(self):
+        self.assertEqual(build_search_index(self.content_dir, self.dest_dir, self.manifest), 2)
+        self.assertEqual(self.read("index.json")["sections"], {
+            "_root": {"file": "sections/_root.json", "pages": 1},
+            "blog": {"file": "sections/blog.json", "pages": 1},
+        })
+        self.assertEqual(self.read("sections/blog.json")["pages"], [["/blog/post.html", "Post"]])
+
+    def test_tokenize_only_changed_pages(self):
+        build_search_index(self.content_dir, self.dest_dir, self.manifest)
+        self.write("blog/post.md", "# Post\n\nEdited")
+        self.assertEqual(build_search_index(self.content_dir, self.dest_dir, self.manifest), 1)
+        self.assertIn("edited", self.read("sections/blog.json")["terms"])
+
+    def test_remove_shards_of_deleted_sections(self):
+        build_search_index(self.content_dir, self.dest_dir, self.manifest)
+        os.remove(os.path.join(self.content_dir, "blog", "post.md"))
+        build_search_index(self.content_dir, self.dest_dir, self.manifest)
+        self.assertEqual(list(self.read("index.json")["sections"]), ["_root"])
+        self.assertFalse(os.path.exists(os.path.join(self.dest_dir, "search", "sections", "blog.json")))
+        self.assertEqual(list(self.manifest.search), [os.path.join(self.content_dir, "index.md")])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from manifest import BuildManifest
+from static import sync_static
+
+class SyncStaticShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source_dir = os.path.join(self.temp_dir.name, "static")
+        self.dest_dir = os.path.join(self.temp_dir.name, "public")
+        self.manifest = BuildManifest()
+        self.write(os.path.join(self.source_dir, "styles.css"), "body {}")
+        self.write(os.path.join(self.source_dir, "images", "logo.png"), "png")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_copy_all_files_on_first_sync(self):
+        stats = sync_static(self.source_dir, self.dest_dir, self.manifest)
+        self.assertEqual((stats.copied_files, stats.copied_bytes, stats.skipped_files), (2, 10, 0))
+        self.assertEqual(self.read(os.path.join(self.dest_dir, "images", "logo.png")), "png")
+
+    def test_skip_unchanged_files(self):
+        sync_static(self.source_dir, self.dest_dir, self.manifest)
+        stats = sync_static(self.source_dir, self.dest_dir, self.manifest)
+        self.assertEqual((stats.copied_files, stats.skipped_files, stats.skipped_bytes), (0, 2, 10))
+
+    def test_copy_changed_files(self):
+        sync_static(self.source_dir, self.dest_dir, self.manifest)
+        self.write(os.path.join(self.source_dir, "styles.css"), "p {}")
+        stats = sync_static(self.source_dir, self.dest_dir, self.manifest)
+        self.assertEqual((stats.copied_files, stats.skipped_files), (1, 1))
+        self.assertEqual(self.read(os.path.join(self.dest_dir, "styles.css")), "p {}")
+
+    def test_skip_touched_files_with_same_hash(self):
+        sync_static(self.source_dir, self.dest_dir, self.manifest)
+        source = os.path.join(self.source_dir, "styles.css")
+        os.utime(source, ns=(0, 0))
+        stats = sync_static(self.source_dir, self.dest_dir, self.manifest, verify_hash = True)
+        self.assertEqual((stats.copied_files, stats.skipped_files), (0, 2))
+        self.assertEqual(os.stat(os.path.join(self.dest_dir, "styles.css")).st_mtime_ns, 0)
+
+    def test_minify_copies_and_skip_them_by_mtime(self):
+        self.write(os.path.join(self.source_dir, "styles.css"), "p {\n  color: red;\n}\n")
+        sync_static(self.source_dir, self.dest_dir, self.manifest, minify = True)
+        self.assertEqual(self.read(os.path.join(self.dest_dir, "styles.css")), "p{color: red;}")
+        stats = sync_static(self.source_dir, self.dest_dir, self.manifest, minify = True)
+        self.assertEqual((stats.copied_files, stats.skipped_files), (0, 2))
+
+    def test_prune_files_whose_source_was_removed(self):
+        self.write(os.path.join(self.dest_dir, "index.html"), "page")
+        sync_static(self.source_dir, self.dest_dir, self.manifest)
+        os.remove(os.path.join(self.source_dir, "styles.css"))
+        stats = sync_static(self.source_dir, self.dest_dir, self.manifest)
+        self.assertEqual(stats.pruned_files, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest_dir, "styles.css")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest_dir, "index.html")))
+
+if __name__ == "__main__":
+    unittest.main()
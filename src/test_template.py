@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from template import compile_template, load_template
+
+class CompileTemplateShould(unittest.TestCase):
+    def test_render_slots_with_variables(self):
+        template = compile_template("<title>{{ Title }}</title><main>{{Content}}</main>{{ Missing }}")
+        actual = template.render({"Title": "Home", "Content": "<p>hi</p>"})
+        self.assertEqual(actual, "<title>Home</title><main><p>hi</p></main>")
+
+    def test_split_template_into_literals_and_slots(self):
+        template = compile_template("a{{ X }}b{{ Y }}")
+        self.assertEqual(template.parts, ["a", None, "b", None])
+        self.assertEqual(template.slots, [(1, "X"), (3, "Y")])
+
+class LoadTemplateShould(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "template.html")
+        self.partial_path = os.path.join(self.temp_dir.name, "partials", "nav.html")
+        self.write(self.path, "<body>{{> nav }}{{ Content }}</body>")
+        self.write(self.partial_path, "<nav>{{ Title }}</nav>")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path, text, mtime_ns = None):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_inline_partials(self):
+        template = load_template(self.path)
+        self.assertEqual(template.render({"Title": "Home", "Content": "hi"}), "<body><nav>Home</nav>hi</body>")
+        self.assertEqual(template.dependencies, [self.path, self.partial_path])
+        self.assertEqual(template.parts, ["<body><nav>", None, "</nav>", None, "</body>"])
+
+    def test_return_cached_template_until_a_dependency_changes(self):
+        template = load_template(self.path)
+        self.assertIs(load_template(self.path), template)
+        self.write(self.partial_path, "<nav>changed</nav>", mtime_ns = 1)
+        reloaded = load_template(self.path)
+        self.assertIsNot(reloaded, template)
+        self.assertEqual(reloaded.render({"Content": "hi"}), "<body><nav>changed</nav>hi</body>")
+
+    def test_raise_exception_on_recursive_partials(self):
+        self.write(self.partial_path, "<nav>{{> nav }}</nav>")
+        with self.assertRaises(Exception) as cm:
+            load_template(self.path)
+        self.assertEqual(str(cm.exception), "partial includes itself: 'nav'")
+
+if __name__ == "__main__":
+    unittest.main()
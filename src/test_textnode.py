@@ -75,5 +75,11 @@ class TestTextNode(unittest.TestCase):
         expected = LeafNode("img", "", {"src": "bar", "alt": "foo"})
         self.assertEqual(str(actual), str(expected))
 
+    def test_text_node_to_html_node_should_share_props_of_repeated_urls(self):
+        first = text_node_to_html_node(TextNode("foo", TextType.LINK, "/a?b&c"))
+        second = text_node_to_html_node(TextNode("bar", TextType.LINK, "/a?b&c"))
+        self.assertIs(first.props, second.props)
+        self.assertEqual(second.to_html(), "<a href=\"/a?b&amp;c\">bar</a>")
+
 if __name__ == "__main__":
     unittest.main()
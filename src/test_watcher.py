@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+from watcher import InotifyWatcher, PollingWatcher
+
+class WatcherTests:
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir_path = os.path.join(self.temp_dir.name, "content")
+        os.makedirs(os.path.join(self.dir_path, "blog"))
+        self.file_path = os.path.join(self.temp_dir.name, "template.html")
+        self.write(self.file_path, "template")
+        self.watcher = self.create_watcher([self.dir_path], [self.file_path])
+
+    def tearDown(self):
+        self.watcher.close()
+        self.temp_dir.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w") as f:
+            f.write(text)
+
+    def test_report_files_written_in_watched_dirs(self):
+        path = os.path.join(self.dir_path, "blog", "post.md")
+        self.write(path, "# Post")
+        self.assertEqual(self.watcher.wait(5), {path})
+
+    def test_report_watched_files_only(self):
+        self.write(os.path.join(self.temp_dir.name, "other.txt"), "other")
+        self.write(self.file_path, "changed template")
+        self.assertEqual(self.watcher.wait(5), {self.file_path})
+
+class PollingWatcherShould(WatcherTests, unittest.TestCase):
+    def create_watcher(self, dirs, files):
+        return PollingWatcher(dirs, files, interval = 0.01)
+
+class InotifyWatcherShould(WatcherTests, unittest.TestCase):
+    def create_watcher(self, dirs, files):
+        try:
+            return InotifyWatcher(dirs, files)
+        except OSError as e:
+            self.skipTest(f"inotify is not available: {e}")
@@ -1,4 +1,6 @@
+import functools
 from enum import Enum
+from htmlnode import FrozenProps
 from leafnode import LeafNode
 
 class TextType(Enum):
@@ -10,6 +12,8 @@ class TextType(Enum):
     IMAGE = "image"
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url = None):
         self.text = text
         self.text_type = text_type
@@ -25,6 +29,23 @@ class TextNode:
     def __repr__(self):
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
 
+class FrozenTextNode(TextNode):
+    __slots__ = ()
+
+    def __init__(self, text, text_type, url = None):
+        object.__setattr__(self, "text", text)
+        object.__setattr__(self, "text_type", text_type)
+        object.__setattr__(self, "url", url)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("frozen text node cannot be modified")
+
+    def __hash__(self):
+        return hash((self.text, self.text_type, self.url))
+
+def freeze_text_node(node):
+    return FrozenTextNode(node.text, node.text_type, node.url)
+
 def text_node_to_html_node(node):
     match node.text_type:
         case TextType.TEXT:
@@ -36,9 +57,30 @@ def text_node_to_html_node(node):
         case TextType.CODE:
             return LeafNode("code", node.text)
         case TextType.LINK:
-            return LeafNode("a", node.text, {"href": f"{node.url}"})
+            return LeafNode("a", node.text, link_props(str(node.url)))
         case TextType.IMAGE:
-            return LeafNode("img", "", {"src": f"{node.url}", "alt": f"{node.text}"})
+            return LeafNode("img", "", image_props(str(node.url), str(node.text)))
         case _:
             raise Exception("text node must have a valid text type")
+
+# sites link to the same few urls from every page, so their props are shared
+# and rendered once instead of per node
+@functools.lru_cache(maxsize=4096)
+def link_props(url):
+    return FrozenProps(href=url)
+
+@functools.lru_cache(maxsize=4096)
+def image_props(url, alt):
+    return FrozenProps(src=url, alt=alt, **image_variants.get(url, {}))
+
+# url -> extra img attributes (width, height, srcset) found by the image stage
+image_variants = {}
+
+def set_image_variants(variants):
+    global image_variants
+    image_variants = variants
+    image_props.cache_clear()
+
+def current_image_variants():
+    return image_variants
     
\ No newline at end of file
@@ -0,0 +1,132 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+# events arriving this soon after another are folded into the same batch,
+# so an editor's write-then-rename save triggers one rebuild
+SETTLE_SECONDS = 0.02
+
+def create_watcher(dirs, files = ()):
+    try:
+        return InotifyWatcher(dirs, files)
+    except OSError:
+        return PollingWatcher(dirs, files)
+
+class InotifyWatcher:
+    def __init__(self, dirs, files = ()):
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        self.recursive = set()
+        self.files = set(map(os.path.normpath, files))
+        for path in dirs:
+            for dir_path, _, _ in os.walk(path):
+                self.add_watch(dir_path, True)
+        for path in self.files:
+            self.add_watch(os.path.dirname(path) or ".", False)
+
+    def add_watch(self, path, recursive):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"cannot watch {path}")
+        self.watches[wd] = path
+        if recursive:
+            self.recursive.add(wd)
+
+    def wait(self, timeout = None):
+        changes = set()
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        while readable:
+            self.read_events(changes)
+            readable, _, _ = select.select([self.fd], [], [], SETTLE_SECONDS)
+        return changes
+
+    def read_events(self, changes):
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + name_length].rstrip(b"\0"))
+            offset += name_length
+            if mask & IN_Q_OVERFLOW:
+                changes.add(None)
+                continue
+            if wd not in self.watches:
+                continue
+            path = os.path.join(self.watches[wd], name)
+            if wd in self.recursive:
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        for dir_path, _, file_names in os.walk(path):
+                            self.add_watch(dir_path, True)
+                            changes.update(os.path.join(dir_path, file_name) for file_name in file_names)
+                    else:
+                        # a directory moved away doesn't report its files
+                        changes.add(None)
+                    continue
+                changes.add(path)
+            elif os.path.normpath(path) in self.files:
+                changes.add(os.path.normpath(path))
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    def __init__(self, dirs, files = (), interval = 0.25):
+        self.dirs = list(dirs)
+        self.files = list(files)
+        self.interval = interval
+        self.snapshot = self.take_snapshot()
+
+    def take_snapshot(self):
+        snapshot = {}
+        paths = list(self.files)
+        for path in self.dirs:
+            for dir_path, _, file_names in os.walk(path):
+                paths.extend(os.path.join(dir_path, file_name) for file_name in file_names)
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval)
+            snapshot = self.take_snapshot()
+            changes = set(
+                path for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)
+            )
+            self.snapshot = snapshot
+            if changes or (deadline is not None and time.monotonic() >= deadline):
+                return changes
+
+    def close(self):
+        pass
@@ -0,0 +1,52 @@
+// Client for the index written by src/searchindex.py: search/index.json lists
+// one shard per site section, and a shard is fetched only when first searched.
+const searchShards = {};
+
+async function loadSearchSections() {
+    const response = await fetch("/search/index.json");
+    return (await response.json()).sections;
+}
+
+async function loadSearchShard(file) {
+    if (!(file in searchShards)) {
+        searchShards[file] = fetch("/search/" + file).then((response) => response.json());
+    }
+    return searchShards[file];
+}
+
+function decodePostings(posting) {
+    // gaps between ascending page ids, each followed by the term's count
+    const decoded = [];
+    let pageId = 0;
+    for (let index = 0; index < posting.length; index += 2) {
+        pageId += posting[index];
+        decoded.push([pageId, posting[index + 1]]);
+    }
+    return decoded;
+}
+
+async function searchSite(query, sections) {
+    const terms = query.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [];
+    const available = await loadSearchSections();
+    const names = sections || Object.keys(available);
+    const results = [];
+    for (const name of names) {
+        const shard = await loadSearchShard(available[name].file);
+        // a page must contain every term; its score is the sum of their counts
+        let scores = null;
+        for (const term of terms) {
+            const next = new Map();
+            for (const [pageId, count] of decodePostings(shard.terms[term] || [])) {
+                if (scores === null || scores.has(pageId)) {
+                    next.set(pageId, (scores === null ? 0 : scores.get(pageId)) + count);
+                }
+            }
+            scores = next;
+        }
+        for (const [pageId, score] of scores || []) {
+            const [url, title] = shard.pages[pageId];
+            results.push({ url, title, score });
+        }
+    }
+    return results.sort((a, b) => b.score - a.score);
+}